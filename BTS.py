@@ -1,7 +1,19 @@
 from manim import *
 import numpy as np
 
-class BrazilianTensileStrengthTest(Scene):
+from bts_batch import compute_bts
+from bts_uncertainty import DEFAULT_MEASUREMENT, monte_carlo_bts
+from plot_utils import HistogramBars
+from static_layers import StaticLayerMixin
+from streaming_writer import StreamingEncoderMixin
+
+class BrazilianTensileStrengthTest(StreamingEncoderMixin, StaticLayerMixin, Scene):
+    # Optional result row from bts_batch.py (specimen_id, D, T, P, BTS) shown at the end
+    specimen = None
+    # Measurement scatter (standard deviations) of P in kN and D, T in mm for the Monte Carlo histogram
+    measurement_std = (DEFAULT_MEASUREMENT["P"][1], DEFAULT_MEASUREMENT["D"][1], DEFAULT_MEASUREMENT["T"][1])
+    uncertainty_samples = 2_000_000
+
     def construct(self):
         # Parameters
         disk_radius = 2
@@ -53,6 +65,8 @@ class BrazilianTensileStrengthTest(Scene):
 
         # Add everything to the scene
         self.play(FadeIn(disk), FadeIn(top_platen), FadeIn(bottom_platen), run_time=1)
+        # Disk, platens and watermark never move again: draw them once into the background
+        self.bake_static(watermark, disk, top_platen, bottom_platen)
         self.play(GrowArrow(top_arrow), GrowArrow(bottom_arrow), Write(load_label), run_time=1)
 
         # Gradually compress platens (keep platens in contact with disk, only show load arrows moving in)
@@ -80,6 +94,7 @@ class BrazilianTensileStrengthTest(Scene):
         x_label.next_to(axes, DOWN, buff=0.2)
         y_label.next_to(axes, LEFT, buff=0.2)
         self.play(FadeIn(axes), Write(x_label), Write(y_label), run_time=0.7)
+        self.bake_static(axes, x_label, y_label)
 
         # Animate the load-displacement curve up to crack
         crack_group = None
@@ -101,6 +116,7 @@ class BrazilianTensileStrengthTest(Scene):
             if not crack_started and frac > crack_start_frac:
                 # The moment the load drops, animate the crack and the drop together
                 crack_started = True
+                self.next_section("peak load")
                 crack_group = VGroup()
                 for j, crack_frac in enumerate(np.linspace(0, 1, 30)):
                     up = Line(
@@ -160,5 +176,81 @@ class BrazilianTensileStrengthTest(Scene):
         p_label = Text("P = max load", font_size=28, color=RED_E)
         p_label.next_to(eq, DOWN, buff=0.3)
         self.play(Write(p_label), run_time=0.7)
+        # Evaluate the equation for a measured specimen
+        if self.specimen is not None:
+            P, D, T = self.specimen["P"], self.specimen["D"], self.specimen["T"]
+            bts_value = self.specimen.get("BTS", float(compute_bts(P, D, T)))
+            result = MathTex(
+                rf"\text{{BTS}} = \frac{{2 \times {P * 1000:.0f}\,\text{{N}}}}"
+                rf"{{\pi \times {D:.1f} \times {T:.1f}\,\text{{mm}}^2}} = {bts_value:.2f}\,\text{{MPa}}",
+                font_size=32
+            )
+            result.to_corner(UL, buff=0.5)
+            specimen_label = Text(f"Specimen {self.specimen['specimen_id']}", font_size=22)
+            specimen_label.next_to(result, DOWN, buff=0.2, aligned_edge=LEFT)
+            self.play(Write(result), Write(specimen_label), run_time=1.2)
+
+        # Monte Carlo uncertainty of the BTS from the scatter of P, D and T
+        if self.specimen is not None:
+            means = (self.specimen["P"], self.specimen["D"], self.specimen["T"])
+        else:
+            means = (DEFAULT_MEASUREMENT["P"][0], DEFAULT_MEASUREMENT["D"][0], DEFAULT_MEASUREMENT["T"][0])
+        mc = monte_carlo_bts(self.uncertainty_samples, *zip(means, self.measurement_std))
+        edges = mc.edges
+        bin_width = edges[1] - edges[0]
+        # Histograms as probability densities, so the bars settle instead of growing without bound
+        density = mc.cumulative_counts / (mc.frame_samples[:, None] * bin_width)
+        # Axes sized for the converged histogram; the spikier early frames are clipped at its top
+        y_max = 1.15 * density[-1].max()
+
+        hist_axes = Axes(
+            x_range=[edges[0], edges[-1], (edges[-1] - edges[0]) / 4],
+            y_range=[0, y_max, y_max / 4],
+            x_length=3,
+            y_length=1.6,
+            axis_config={"color": WHITE, "include_ticks": False},
+            tips=False
+        )
+        hist_axes.to_edge(LEFT, buff=0.7).shift(DOWN * 0.3)
+        hist_x_label = Text("BTS (MPa)", font_size=18)
+        hist_x_label.next_to(hist_axes, DOWN, buff=0.2)
+        hist_title = Text("Monte Carlo", font_size=18)
+        hist_title.next_to(hist_axes, UP, buff=0.2)
+        self.play(FadeIn(hist_axes), Write(hist_x_label), Write(hist_title), run_time=0.7)
+
+        # One VMobject for all bars, driven by the precomputed cumulative counts
+        bars = HistogramBars(hist_axes, edges, stroke_width=1, stroke_color=BLUE_A, fill_color=BLUE_E, fill_opacity=0.8)
+        frame_tracker = ValueTracker(0)
+        frame_index = np.arange(len(mc.frame_samples))
+
+        def update_bars(mob):
+            if len(frame_index) < 2:
+                # A single histogram frame (very few samples): nothing to blend
+                mob.set_heights(density[0])
+                return
+            k = frame_tracker.get_value()
+            j = min(int(k), len(frame_index) - 2)
+            t = k - j
+            mob.set_heights((1 - t) * density[j] + t * density[j + 1])
+
+        bars.add_updater(update_bars)
+        sample_count = DecimalNumber(mc.frame_samples[0], num_decimal_places=0, group_with_commas=True, font_size=22)
+        sample_count.add_updater(lambda m: m.set_value(np.interp(frame_tracker.get_value(), frame_index, mc.frame_samples)))
+        n_label = VGroup(MathTex("N =", font_size=26), sample_count).arrange(RIGHT, buff=0.15)
+        n_label.next_to(hist_title, UP, buff=0.15)
+        self.add(bars, n_label)
+        self.play(frame_tracker.animate.set_value(frame_index[-1]), run_time=3, rate_func=linear)
+        bars.clear_updaters()
+        sample_count.clear_updaters()
+
+        # 95% confidence interval from the sample percentiles
+        low, high = mc.intervals[0.95]
+        ci_lines = VGroup(*[
+            DashedLine(hist_axes.c2p(x, 0), hist_axes.c2p(x, y_max), color=YELLOW, stroke_width=2)
+            for x in (low, high)
+        ])
+        ci_label = MathTex(rf"95\%\ \text{{CI}}: [{low:.2f}, {high:.2f}]\,\text{{MPa}}", font_size=24, color=YELLOW)
+        ci_label.next_to(hist_x_label, DOWN, buff=0.15)
+        self.play(Create(ci_lines), Write(ci_label), run_time=0.8)
         # Hold final frame
         self.wait(2)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Batch Brazilian tensile strength (BTS) computation from raw test logs.
+#
+# The specimen table is a CSV with columns specimen_id, D, T (diameter and
+# thickness in mm). Every specimen has a load-displacement log in the log
+# directory named <specimen_id>.csv / .txt / .dat with displacement in the
+# first column and load (kN) in the second. BTS = 2P / (pi D T) in MPa.
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+LOG_EXTENSIONS = (".csv", ".txt", ".dat")
+RESULT_FIELDS = ["specimen_id", "D", "T", "P", "displacement_at_peak", "BTS"]
+
+
+def compute_bts(P, D, T):
+    """BTS in MPa from peak load P (kN), diameter D (mm) and thickness T (mm)."""
+    P = np.asarray(P, dtype=float)
+    D = np.asarray(D, dtype=float)
+    T = np.asarray(T, dtype=float)
+    return 2 * P * 1000 / (np.pi * D * T)
+
+
+def load_log(path):
+    """Reads a load-displacement log into a 2D float array (header rows skipped)."""
+    delimiter = "," if path.endswith(".csv") else None
+    try:
+        return np.loadtxt(path, delimiter=delimiter, comments="#", ndmin=2)
+    except ValueError:
+        # Log starts with a column header
+        return np.loadtxt(path, delimiter=delimiter, comments="#", ndmin=2, skiprows=1)
+
+
+def peak_loads(paths, load_column=1):
+    """Returns (peak loads, displacements at peak) for a chunk of log files."""
+    P = np.empty(len(paths))
+    disp = np.empty(len(paths))
+    for k, path in enumerate(paths):
+        data = load_log(path)
+        i = np.argmax(data[:, load_column])
+        P[k] = data[i, load_column]
+        disp[k] = data[i, 0]
+    return P, disp
+
+
+def read_specimen_table(path):
+    """Reads specimen_id, D, T rows from the specimen CSV."""
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    ids = [row["specimen_id"].strip() for row in rows]
+    D = np.array([float(row["D"]) for row in rows])
+    T = np.array([float(row["T"]) for row in rows])
+    return ids, D, T
+
+
+def find_log(log_dir, specimen_id):
+    for ext in LOG_EXTENSIONS:
+        path = os.path.join(log_dir, specimen_id + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def summary_statistics(bts):
+    """Count, mean, standard deviation, coefficient of variation, min and max of BTS."""
+    bts = np.asarray(bts, dtype=float)
+    if bts.size == 0:
+        return {"count": 0}
+    mean = bts.mean()
+    std = bts.std(ddof=1) if bts.size > 1 else 0.0
+    return {
+        "count": int(bts.size),
+        "mean": mean,
+        "std": std,
+        "cov": std / mean if mean else np.nan,
+        "min": bts.min(),
+        "max": bts.max(),
+    }
+
+
+def process_campaign(log_dir, specimen_table, workers=None, chunk_size=64, load_column=1):
+    """Finds the peak load of every specimen log and computes BTS for the whole campaign."""
+    ids, D, T = read_specimen_table(specimen_table)
+    paths = [find_log(log_dir, specimen_id) for specimen_id in ids]
+    found = np.array([path is not None for path in paths], dtype=bool)
+    for specimen_id, path in zip(ids, paths):
+        if path is None:
+            print(f"No log found for specimen {specimen_id}, skipping")
+
+    ids = [specimen_id for specimen_id, ok in zip(ids, found) if ok]
+    paths = [path for path in paths if path is not None]
+    D, T = D[found], T[found]
+
+    # Logs are read in chunks so each worker process amortises its start-up over many files
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        parts = [peak_loads(chunk, load_column) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(peak_loads, chunks, [load_column] * len(chunks)))
+
+    P = np.concatenate([p for p, _ in parts]) if parts else np.empty(0)
+    disp = np.concatenate([d for _, d in parts]) if parts else np.empty(0)
+    bts = compute_bts(P, D, T)
+
+    rows = [
+        dict(zip(RESULT_FIELDS, values))
+        for values in zip(ids, D, T, P, disp, bts)
+    ]
+    return rows, summary_statistics(bts)
+
+
+def write_results(rows, summary, path):
+    """Writes the per-specimen results table and a summary table next to it."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: (f"{value:.6g}" if key != "specimen_id" else value) for key, value in row.items()})
+
+    summary_path = os.path.splitext(path)[0] + "_summary.csv"
+    with open(summary_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["statistic", "BTS (MPa)"])
+        for key, value in summary.items():
+            writer.writerow([key, f"{value:.6g}"])
+    return summary_path
+
+
+def bts_scene_for(row):
+    """Returns a BrazilianTensileStrengthTest subclass that shows the given result row."""
+    from BTS import BrazilianTensileStrengthTest
+
+    name = "BrazilianTensileStrengthTest_" + "".join(c if c.isalnum() else "_" for c in str(row["specimen_id"]))
+    return type(name, (BrazilianTensileStrengthTest,), {"specimen": dict(row)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute Brazilian tensile strength for a campaign of test logs.")
+    parser.add_argument("log_dir", help="directory holding one load-displacement log per specimen")
+    parser.add_argument("specimen_table", help="CSV with specimen_id, D and T (mm) columns")
+    parser.add_argument("results", help="output CSV for the results table")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--load-column", type=int, default=1, help="column index of the load in the logs")
+    parser.add_argument("--render", metavar="SPECIMEN_ID", help="render the BTS scene for one specimen")
+    parser.add_argument("-q", "--quality", choices=["l", "m", "h", "k"], default="l")
+    args = parser.parse_args()
+
+    rows, summary = process_campaign(args.log_dir, args.specimen_table, args.workers, load_column=args.load_column)
+    summary_path = write_results(rows, summary, args.results)
+    print(f"{len(rows)} specimens written to {args.results} (summary in {summary_path})")
+    if summary["count"]:
+        print(f"BTS = {summary['mean']:.3f} +/- {summary['std']:.3f} MPa "
+              f"(min {summary['min']:.3f}, max {summary['max']:.3f})")
+
+    if args.render:
+        from manim import tempconfig
+
+        row = next((row for row in rows if row["specimen_id"] == args.render), None)
+        if row is None:
+            parser.error(f"specimen {args.render} is not in the results")
+        quality = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "k": "fourk_quality"}[args.quality]
+        with tempconfig({"quality": quality}):
+            bts_scene_for(row)().render()
+
+
+if __name__ == '__main__':
+    main()
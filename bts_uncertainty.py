@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Monte Carlo uncertainty of the Brazilian tensile strength.
+#
+#   python bts_uncertainty.py --P 10 0.2 --D 54 0.1 --T 27 0.1 -n 5000000
+#
+# Peak load P (kN), diameter D and thickness T (mm) are drawn as independent
+# normal variables (mean, standard deviation) and BTS = 2P / (pi D T) is
+# evaluated on whole chunks of samples at once. Besides the percentile
+# confidence intervals, the histogram counts of the first n samples are
+# accumulated for a series of growing n, so an animation of the histogram
+# filling up only indexes a small (frames x bins) array.
+
+import argparse
+from collections import namedtuple
+
+import numpy as np
+
+from bts_batch import compute_bts
+
+MonteCarloResult = namedtuple(
+    "MonteCarloResult",
+    ["edges", "frame_samples", "cumulative_counts", "mean", "std", "intervals", "nominal"],
+)
+
+# Default measurement of the BTS scene: (mean, standard deviation) in kN and mm
+DEFAULT_MEASUREMENT = {"P": (10.0, 0.2), "D": (54.0, 0.1), "T": (27.0, 0.1)}
+
+
+def linearized_bts_std(P, D, T):
+    """First-order standard deviation of BTS from (mean, std) pairs of P, D and T."""
+    bts = float(compute_bts(P[0], D[0], T[0]))
+    relative = np.sqrt((P[1] / P[0]) ** 2 + (D[1] / D[0]) ** 2 + (T[1] / T[0]) ** 2)
+    return bts, bts * relative
+
+
+def sample_bts(n_samples, P, D, T, chunk_size=1_000_000, seed=0):
+    """Yields chunks of BTS samples (MPa) for normal P, D, T given as (mean, std) pairs."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_samples, chunk_size):
+        n = min(chunk_size, n_samples - start)
+        yield compute_bts(rng.normal(*P, n), rng.normal(*D, n), rng.normal(*T, n))
+
+
+def monte_carlo_bts(
+    n_samples=2_000_000,
+    P=DEFAULT_MEASUREMENT["P"],
+    D=DEFAULT_MEASUREMENT["D"],
+    T=DEFAULT_MEASUREMENT["T"],
+    bins=60,
+    n_frames=60,
+    first_frame_samples=50,
+    confidence=(0.90, 0.95, 0.99),
+    chunk_size=1_000_000,
+    seed=0,
+):
+    """Runs the simulation; cumulative_counts[k] is the histogram of the first frame_samples[k] samples."""
+    nominal, spread = linearized_bts_std(P, D, T)
+    # Fixed bin edges from the linearized spread, so every frame shares them
+    edges = np.linspace(nominal - 4.5 * spread, nominal + 4.5 * spread, bins + 1)
+    # Geometric growth of the sample count: the first frames show individual bars filling in
+    frame_samples = np.unique(np.geomspace(min(first_frame_samples, n_samples), n_samples, n_frames).round().astype(np.int64))
+
+    samples = np.empty(n_samples)
+    counts = np.zeros((len(frame_samples), bins), dtype=np.int64)
+    running = np.zeros(bins, dtype=np.int64)
+    frame = 0
+    offset = 0
+    for chunk in sample_bts(n_samples, P, D, T, chunk_size, seed):
+        samples[offset:offset + len(chunk)] = chunk
+        # Out-of-range samples go to the outer bins
+        index = np.clip(np.searchsorted(edges, chunk, side="right") - 1, 0, bins - 1)
+        # Split the chunk where frames end, so every sample is binned exactly once
+        ends = frame_samples[frame:] - offset
+        start = 0
+        for end in ends[ends <= len(chunk)]:
+            running += np.bincount(index[start:end], minlength=bins)
+            counts[frame] = running
+            start = end
+            frame += 1
+        running += np.bincount(index[start:], minlength=bins)
+        offset += len(chunk)
+
+    tails = [(1 - level) / 2 for level in confidence]
+    bounds = np.percentile(samples, np.ravel([[100 * t, 100 * (1 - t)] for t in tails]))
+    intervals = {level: (bounds[2 * k], bounds[2 * k + 1]) for k, level in enumerate(confidence)}
+    return MonteCarloResult(
+        edges, frame_samples, counts, samples.mean(), samples.std(ddof=1), intervals, nominal
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo confidence intervals of the Brazilian tensile strength.")
+    parser.add_argument("--P", nargs=2, type=float, default=DEFAULT_MEASUREMENT["P"], metavar=("MEAN", "STD"),
+                        help="peak load in kN")
+    parser.add_argument("--D", nargs=2, type=float, default=DEFAULT_MEASUREMENT["D"], metavar=("MEAN", "STD"),
+                        help="diameter in mm")
+    parser.add_argument("--T", nargs=2, type=float, default=DEFAULT_MEASUREMENT["T"], metavar=("MEAN", "STD"),
+                        help="thickness in mm")
+    parser.add_argument("-n", "--samples", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = monte_carlo_bts(args.samples, tuple(args.P), tuple(args.D), tuple(args.T), seed=args.seed)
+    print(f"BTS = {result.mean:.4f} +/- {result.std:.4f} MPa from {args.samples} samples "
+          f"(nominal {result.nominal:.4f} MPa)")
+    for level, (low, high) in result.intervals.items():
+        print(f"{100 * level:.0f}% interval: [{low:.4f}, {high:.4f}] MPa")
+
+
+if __name__ == '__main__':
+    main()
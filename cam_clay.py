@@ -0,0 +1,126 @@
+# Modified Cam-Clay driver for conventional triaxial compression.
+#
+# Strain-driven explicit integration of drained (constant sigma3) and
+# undrained (constant volume) paths. Every quantity is an array over the
+# paths, so a whole series (different p'0, OCR or drainage per path) is
+# integrated together in one call, and results are cached per parameter set.
+#
+# Yield surface f = q^2 + M^2 p' (p' - pc), associated flow, hardening
+# dpc = pc (1 + e) / (lambda - kappa) * d(eps_v plastic), elastic bulk
+# modulus K = (1 + e) p' / kappa and shear modulus from a constant Poisson ratio.
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+CamClayResult = namedtuple("CamClayResult", ["axial_strain", "q", "p", "e", "du", "volumetric_strain"])
+
+
+def elastic_moduli(p, e, kappa, nu):
+    """Bulk modulus K = (1 + e) p' / kappa and shear modulus G from Poisson's ratio."""
+    K = (1 + e) * p / kappa
+    G = 3 * K * (1 - 2 * nu) / (2 * (1 + nu))
+    return K, G
+
+
+def yield_function(p, q, pc, M):
+    """Modified Cam-Clay yield function f = q^2 + M^2 p' (p' - pc)."""
+    return q ** 2 + M ** 2 * p * (p - pc)
+
+
+def tangent_stiffness(p, q, pc, e, lam, kappa, M, nu, plastic):
+    """Entries (Dpp, Dpq, Dqp, Dqq) of the tangent stiffness in (eps_v, eps_q) -> (p', q)."""
+    K, G = elastic_moduli(p, e, kappa, nu)
+    f_p = M ** 2 * (2 * p - pc)
+    f_q = 2 * q
+    hardening = M ** 2 * p * pc * (1 + e) / (lam - kappa) * f_p
+    denominator = K * f_p ** 2 + 3 * G * f_q ** 2 + hardening
+    # Elastic paths keep the elastic stiffness (the plastic correction is masked out, never divided)
+    c = np.divide(1, denominator, out=np.zeros_like(denominator), where=np.broadcast_to(plastic, denominator.shape))
+    Dpp = K - c * (K * f_p) ** 2
+    Dpq = -c * K * f_p * 3 * G * f_q
+    Dqq = 3 * G - c * (3 * G * f_q) ** 2
+    return Dpp, Dpq, Dpq, Dqq
+
+
+def control_increments(D, d_axial, drained):
+    """(d eps_v, d eps_q) for an axial strain increment: zero volume change or constant sigma3 (dp' = dq/3)."""
+    Dpp, Dpq, Dqp, Dqq = D
+    # Constant sigma3: d eps_r = (d eps_v - d eps_a) / 2, d eps_q = d eps_a - d eps_v / 3, and dp' - dq/3 = 0
+    a = Dpq - Dqq / 3
+    d_volumetric_drained = -a * d_axial / (Dpp - Dqp / 3 - a / 3)
+    d_volumetric = np.where(drained, d_volumetric_drained, 0.0)
+    return d_volumetric, d_axial - d_volumetric / 3
+
+
+@lru_cache(maxsize=32)
+def _integrate(p0, ocr, e0, drained, lam, kappa, M, nu, axial_strain, substeps):
+    p = np.array(p0, dtype=float)
+    pc = p * np.array(ocr, dtype=float)
+    e = np.array(e0, dtype=float) * np.ones_like(p)
+    drained = np.array(drained, dtype=bool) * np.ones_like(p, dtype=bool)
+    q = np.zeros_like(p)
+    du = np.zeros_like(p)
+    volumetric = np.zeros_like(p)
+    axial_strain = np.array(axial_strain)
+
+    out = {key: np.empty((len(p), len(axial_strain))) for key in CamClayResult._fields[1:]}
+
+    def record(k):
+        out["q"][:, k] = q
+        out["p"][:, k] = p
+        out["e"][:, k] = e
+        out["du"][:, k] = du
+        out["volumetric_strain"][:, k] = volumetric
+
+    record(0)
+    for k in range(1, len(axial_strain)):
+        d_axial = (axial_strain[k] - axial_strain[k - 1]) / substeps
+        for _ in range(substeps):
+            on_surface = yield_function(p, q, pc, M) >= -1e-9 * pc ** 2
+            # Elastic predictor decides loading (plastic) or unloading/elastic
+            D_elastic = tangent_stiffness(p, q, pc, e, lam, kappa, M, nu, False)
+            dv, dq_strain = control_increments(D_elastic, d_axial, drained)
+            K, G = elastic_moduli(p, e, kappa, nu)
+            loading = K * M ** 2 * (2 * p - pc) * dv + 3 * G * 2 * q * dq_strain > 0
+            plastic = on_surface & loading
+
+            D = tangent_stiffness(p, q, pc, e, lam, kappa, M, nu, plastic)
+            dv, dq_strain = control_increments(D, d_axial, drained)
+            dp = D[0] * dv + D[1] * dq_strain
+            dq = D[2] * dv + D[3] * dq_strain
+
+            p = p + dp
+            q = q + dq
+            # Total mean stress rises by dq/3 at constant cell pressure; the rest is excess pore pressure
+            du = du + dq / 3 - dp
+            e = e - (1 + e) * dv
+            volumetric = volumetric + dv
+            # Return to the yield surface, so drift does not accumulate over the explicit steps
+            pc = np.where(plastic | (yield_function(p, q, pc, M) > 0), p + q ** 2 / (M ** 2 * p), pc)
+        record(k)
+
+    result = CamClayResult(axial_strain, **out)
+    for array in result:
+        array.setflags(write=False)  # Shared between callers through the cache
+    return result
+
+
+def cam_clay_triaxial(p0, axial_strain, lam=0.2, kappa=0.04, M=0.9, e0=1.0, ocr=1.0, nu=0.3, drained=False, substeps=10):
+    """Integrates triaxial compression paths; outputs have shape (paths, len(axial_strain)).
+
+    p0 (mean effective stress = sigma3 after isotropic consolidation, kPa), ocr, e0
+    and drained are scalars or arrays with one value per path; axial_strain is the
+    strain grid (a fraction, not %). du is the excess pore pressure (zero when drained).
+    """
+    p0, ocr, e0, drained = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(p0, dtype=float)), np.asarray(ocr, dtype=float),
+        np.asarray(e0, dtype=float), np.asarray(drained, dtype=bool),
+    )
+    # Tuples make the parameter set hashable for the cache
+    return _integrate(
+        tuple(p0.tolist()), tuple(ocr.tolist()), tuple(e0.tolist()), tuple(drained.tolist()),
+        float(lam), float(kappa), float(M), float(nu),
+        tuple(np.asarray(axial_strain, dtype=float).tolist()), int(substeps),
+    )
@@ -4,7 +4,57 @@
 from manim import *
 import numpy as np
 
-class ClayTriaxialTest(Scene):
+from cam_clay import cam_clay_triaxial
+from dic_field import DICFieldOverlay
+from plot_utils import stress_path_panel, tracked_curve
+from static_layers import StaticLayerMixin
+from streaming_writer import StreamingEncoderMixin
+
+# Normally consolidated clay of ClayTriaxialTest (also used by the 3D variant)
+CELL_PRESSURE = 150            # sigma3 = p'0 after isotropic consolidation (kPa)
+CRITICAL_STATE_M = 0.9
+MCC_PARAMETERS = {"lam": 0.2, "kappa": 0.04, "M": CRITICAL_STATE_M, "e0": 1.0, "ocr": 1.0}
+# Barreling during shearing, relative to the consolidated specimen
+FINAL_HEIGHT_RATIO = 0.75      # final height is 75% of the height at the start of shearing
+FINAL_MID_BULGE_RATIO = 1.2    # mid-height width is 120% of the width at the start of shearing
+
+
+def clay_response(path_strain, drained=False):
+    """Modified Cam-Clay triaxial response of the clay for axial strains in %."""
+    return cam_clay_triaxial(CELL_PRESSURE, np.asarray(path_strain) / 100, drained=drained, **MCC_PARAMETERS)
+
+
+def shearing_deformation(progress):
+    """Height ratio and mid-height bulge ratio at shearing progress 0..1 (scalars or arrays)."""
+    progress = np.asarray(progress, dtype=float)
+    height_ratio = 1 - (1 - FINAL_HEIGHT_RATIO) * progress ** 1.5
+    mid_bulge_ratio = 1 + (FINAL_MID_BULGE_RATIO - 1) * progress ** 1.2
+    return height_ratio, mid_bulge_ratio
+
+
+def stress_strain_axes():
+    """Axes of the stress-strain graph (axial strain in %, q)."""
+    return Axes(
+        x_range=[0, 10, 2],  # Reduced x-range for better visibility
+        y_range=[0, 100, 20],
+        axis_config={"include_tip": True, "color": WHITE},
+        x_length=3,
+        y_length=2.5,
+        tips=False  # Remove the arrow tips to keep graph inside boundary
+    )
+
+
+def hyperbolic_stress_strain(x, ultimate_strength=88, C_hyperbolic=0.3):
+    """Simplified hyperbolic model for clay stress-strain relationship, q = q_ult * x / (C + x)."""
+    # ultimate_strength (q_ult) defines the asymptote
+    # C affects the initial stiffness (initial slope = q_ult / C)
+    x = np.maximum(x, 0) # Ensure strain is non-negative (works on arrays too)
+    return ultimate_strength * (x / (C_hyperbolic + x))
+
+
+class ClayTriaxialTest(StreamingEncoderMixin, StaticLayerMixin, Scene):
+    show_dic_field = True  # DIC-style shear strain field drawn over the specimen during shearing
+
     def construct(self):
         # No title/subtitle - start directly with the setup
         
@@ -31,14 +81,7 @@ class ClayTriaxialTest(Scene):
         cell_outline.shift(DOWN * 0.5)
         
         # Add stress-strain graph on the right side with proper bounds
-        axes = Axes(
-            x_range=[0, 10, 2],  # Reduced x-range for better visibility
-            y_range=[0, 100, 20],
-            axis_config={"include_tip": True, "color": WHITE},
-            x_length=3,
-            y_length=2.5,
-            tips=False  # Remove the arrow tips to keep graph inside boundary
-        )
+        axes = stress_strain_axes()
         axes.shift(RIGHT * 4)
         
         # Add axis labels
@@ -48,6 +91,18 @@ class ClayTriaxialTest(Scene):
         # Replace "Deviator Stress" with simple "q" label
         y_label = MathTex("q", font_size=32) # Corrected from previous "q" to ensure it's not a typo from my side
         y_label.next_to(axes, LEFT, buff=0.4)
+
+        # Modified Cam-Clay response of a normally consolidated clay sheared undrained,
+        # integrated once over the whole strain range (axial strain in %)
+        critical_state_M = CRITICAL_STATE_M
+        drained = False
+        path_strain = np.linspace(0, 10, 401)
+        mcc = clay_response(path_strain, drained)
+
+        # Effective stress path panel (p'-q) below the stress-strain graph
+        pq_panel = stress_path_panel([0, 180, 60], [0, 100, 20], critical_state_M)
+        pq_panel.next_to(axes, DOWN, buff=0.8)
+        pq_axes = pq_panel[0]
         
         # Top piston (loading cap)
         top_piston = Rectangle(
@@ -107,6 +162,7 @@ class ClayTriaxialTest(Scene):
             Create(axes),
             Write(x_label),
             Write(y_label),
+            FadeIn(pq_panel),
             run_time=1.5
         )
 
@@ -115,18 +171,13 @@ class ClayTriaxialTest(Scene):
         watermark.to_corner(DL, buff=0.2)
         self.add(watermark) # Add to scene, will persist
 
+        # Cell, base, graph axes and watermark stay fixed: draw them once into the background
+        self.bake_static(cell_outline, base, axes, x_label, y_label, pq_panel, watermark)
+
         # Create the stress-strain curve object (but don\'t draw it yet)
         def clay_stress_strain(x):
-            # Simplified hyperbolic model for clay stress-strain relationship
-            # q = q_ult * x / (C + x)
-            # ultimate_strength (q_ult) defines the asymptote
-            # C affects the initial stiffness (initial slope = q_ult / C)
-            ultimate_strength = 88  # Asymptotic ultimate strength
-            C_hyperbolic = 0.3      # Parameter affecting initial stiffness
-            
-            if x < 0: # Ensure strain is non-negative
-                return 0
-            return ultimate_strength * (x / (C_hyperbolic + x))
+            # q from the Modified Cam-Clay path, interpolated on its strain grid
+            return np.interp(x, path_strain, mcc.q[0])
         
         # stress_strain_curve = axes.plot(clay_stress_strain, x_range=[0, 10], color=RED_E) # This line is not used until later
         
@@ -194,6 +245,7 @@ class ClayTriaxialTest(Scene):
             Write(sigma3_label),
             run_time=1.5
         )
+        self.bake_static(sigma3_label)
         
         self.wait(0.5)
         
@@ -309,6 +361,7 @@ class ClayTriaxialTest(Scene):
             Write(sigma1_label),
             run_time=1.5
         )
+        self.bake_static(top_arrow, sigma1_label)
         
         self.wait(0.1)
         
@@ -316,9 +369,6 @@ class ClayTriaxialTest(Scene):
         stages = 100  # Adjusted stages for smoother animation (~5s total for shearing)
         stage_run_time = 15.0 / stages # Adjusted run time per stage
 
-        final_height_ratio = 0.75  # final height will be 75% of initial shearing height
-        final_mid_bulge_ratio = 1.2  # middle width will be 120% of initial shearing width
-        
         # Shearing deformation is relative to consolidated dimensions
         current_sample_height_at_shear_start = consol_height
         current_sample_width_at_shear_start = consol_width
@@ -327,8 +377,7 @@ class ClayTriaxialTest(Scene):
 
         # Show gradual deformation of the sample (bulging middle)
         t_values = np.linspace(0, 1, stages)
-        height_ratios = 1 - (1 - final_height_ratio) * (t_values ** 1.5)
-        mid_bulge_ratios = 1 + (final_mid_bulge_ratio - 1) * (t_values ** 1.2)
+        height_ratios, mid_bulge_ratios = shearing_deformation(t_values)
 
         def bulged_shape(height, mid_ratio):
             """Returns a Polygon representing a bulged sample with curved sides."""
@@ -394,7 +443,54 @@ class ClayTriaxialTest(Scene):
         )
         self.add(current_stress_strain_plot)
 
+        # Effective stress path from the Modified Cam-Clay integration.
+        # It follows the same strain tracker as the stress-strain curve.
+        strain_tracker = ValueTracker(0)
+        stress_path = tracked_curve(pq_axes, mcc.p[0], mcc.q[0], strain_tracker, path_strain, color=RED_E, stroke_width=3)
+        self.add(stress_path)
+
+        # Excess pore pressure (undrained) or volumetric strain (drained) against axial strain,
+        # in the corner the consolidation plot used
+        if drained:
+            response, response_label, response_range = 100 * mcc.volumetric_strain[0], r"\varepsilon_v\,(\%)", [0, 10, 2]
+        else:
+            response, response_label, response_range = mcc.du[0], r"\Delta u", [0, 120, 40]
+        response_axes = Axes(
+            x_range=[0, 10, 2],
+            y_range=response_range,
+            x_length=2.5,
+            y_length=1.2,
+            axis_config={"color": WHITE},
+            tips=False
+        )
+        response_axes.to_corner(UR, buff=0.7)
+        response_x_label = MathTex(r"\varepsilon_a\,(\%)", font_size=24)
+        response_x_label.next_to(response_axes, DOWN, buff=0.15)
+        response_y_label = MathTex(response_label, font_size=24)
+        response_y_label.next_to(response_axes, LEFT, buff=0.15)
+        self.play(FadeIn(response_axes), Write(response_x_label), Write(response_y_label), run_time=0.7)
+        self.bake_static(response_axes, response_x_label, response_y_label)
+        response_curve = tracked_curve(response_axes, path_strain, response, strain_tracker, path_strain, color=BLUE, stroke_width=3)
+        self.add(response_curve)
+
+        # Maximum shear strain field implied by the barreling outline, driven by the same strain tracker
+        if self.show_dic_field:
+            # The overlay image size follows the output resolution (see proxy_render.py)
+            self.resolution_dependent_geometry = True
+            dic_overlay = DICFieldOverlay(
+                consol_width, consol_height, [0, base_top_y, 0], strain_tracker,
+                10 * t_values, height_ratios, mid_bulge_ratios
+            )
+            dic_colorbar = dic_overlay.colorbar()
+            dic_colorbar.next_to(cell_outline, LEFT, buff=0.5)
+            self.play(FadeIn(dic_colorbar), run_time=0.5)
+            self.bake_static(dic_colorbar)
+
         # In shearing, fix glitch: always use a single partial_curve object, and update both top piston and loading ram
+        self.next_section("shearing")
+        if self.show_dic_field:
+            # Only drawn from the first shearing frame on, so the undeformed specimen keeps its colour
+            self.add(dic_overlay)
         for i in range(1, stages): # Loop from 1 to stages-1 for progress calculation
             # Calculate new height based on consolidated height
             new_height = current_sample_height_at_shear_start * height_ratios[i]
@@ -426,6 +522,7 @@ class ClayTriaxialTest(Scene):
                 top_piston.animate.move_to(new_piston_pos),
                 loading_ram.animate.move_to(new_ram_pos),
                 Transform(current_stress_strain_plot, new_stress_strain_plot_segment),
+                strain_tracker.animate.set_value(x_max),
                 run_time=stage_run_time
             )
 
@@ -0,0 +1,123 @@
+# DIC-style displacement and strain field inside the barreling clay specimen.
+#
+# The specimen outline of ClayTriaxialTest follows a barreling map of the
+# consolidated (reference) specimen: heights scale uniformly with the height
+# ratio and each horizontal fibre widens with the sine bulge of the outline,
+#   y = Y h / H0,   x = X (1 + (m - 1) sin(pi Y / H0)).
+# Applying the same map to a reference grid interpolates the boundary motion
+# into the interior. Strains follow from finite differences of the gridded
+# displacements and the maximum shear strain is drawn as a colormapped image
+# in the current configuration. The image pixels keep fixed normalized
+# coordinates, so their reference positions (and everything but the field
+# values) are precomputed and every frame is a handful of array operations.
+
+from manim import *
+import numpy as np
+
+DIC_COLORS = (BLUE_E, TEAL, GREEN, YELLOW, RED)
+
+
+def barreling_displacement(X, Y, height, height_ratio, mid_ratio):
+    """Displacements (u, v) of reference points (X from the axis, Y from the base) under the barreling map."""
+    u = X * (mid_ratio - 1) * np.sin(np.pi * Y / height)
+    v = Y * (height_ratio - 1)
+    return u, v
+
+
+def max_shear_strain(u, v, X, Y):
+    """Engineering maximum shear strain from the Green-Lagrange strains of gridded (rows = Y) displacements."""
+    du_dy, du_dx = np.gradient(u, Y, X)
+    dv_dy, dv_dx = np.gradient(v, Y, X)
+    E_xx = du_dx + 0.5 * (du_dx ** 2 + dv_dx ** 2)
+    E_yy = dv_dy + 0.5 * (du_dy ** 2 + dv_dy ** 2)
+    E_xy = 0.5 * (du_dy + dv_dx + du_dx * du_dy + dv_dx * dv_dy)
+    return 2 * np.sqrt(((E_xx - E_yy) / 2) ** 2 + E_xy ** 2)
+
+
+def colormap_lut(colors=DIC_COLORS, size=256):
+    """(size, 3) uint8 lookup table interpolating linearly between the colors."""
+    anchors = np.array([color_to_rgb(color) for color in colors])
+    positions = np.linspace(0, 1, len(colors))
+    samples = np.linspace(0, 1, size)
+    rgb = np.column_stack([np.interp(samples, positions, anchors[:, k]) for k in range(3)])
+    return (255 * rgb).round().astype(np.uint8)
+
+
+class DICFieldOverlay(ImageMobject):
+    def __init__(self, width, height, base_point, strain_tracker, history_strain, height_ratios, mid_ratios,
+                 opacity=0.85, **kwargs):
+        # Reference (consolidated) specimen: width x height standing on base_point
+        self.ref_width = width
+        self.ref_height = height
+        self.base_point = np.asarray(base_point, dtype=float)
+        self.strain_tracker = strain_tracker
+        self.history = (np.asarray(history_strain), np.asarray(height_ratios), np.asarray(mid_ratios))
+        self.opacity = opacity
+        self.lut = colormap_lut()
+
+        # Image resolution at about half the on-screen pixel density, smoothed by bilinear resampling
+        rows = int(np.clip(round(height * config.pixel_height / config.frame_height / 2), 32, 256))
+        cols = int(np.clip(round(rows * width * self.history[2].max() / height), 16, 256))
+        # Normalized image coordinates: a across the current width, b from the top (row 0) to the base
+        a = np.linspace(-1, 1, cols)
+        b = np.linspace(1, 0, rows)
+        self.Y = b * height
+        self.X = a * width / 2
+        self.grid_X, self.grid_Y = np.meshgrid(self.X, self.Y)
+        self.a = a[None, :]
+        self.bulge = np.sin(np.pi * b)[:, None]
+        self.rows = np.arange(rows)[:, None]
+
+        super().__init__(np.zeros((rows, cols, 4), dtype=np.uint8), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["bilinear"])
+        # Fixed colour scale: the largest shear strain of the whole history
+        self.strain_scale = max(self.shear_field(self.history[0][-1])[0].max(), 1e-9)
+        self.update_field()
+        self.add_updater(lambda m: m.update_field())
+
+    def deformation(self, strain):
+        """Height ratio and mid-height bulge ratio at the given axial strain."""
+        strain_history, height_ratios, mid_ratios = self.history
+        return np.interp(strain, strain_history, height_ratios), np.interp(strain, strain_history, mid_ratios)
+
+    def shear_field(self, strain):
+        """Maximum shear strain on the reference grid, with the deformation it belongs to."""
+        height_ratio, mid_ratio = self.deformation(strain)
+        u, v = barreling_displacement(self.grid_X, self.grid_Y, self.ref_height, height_ratio, mid_ratio)
+        return max_shear_strain(u, v, self.X, self.Y), height_ratio, mid_ratio
+
+    def update_field(self):
+        gamma, height_ratio, mid_ratio = self.shear_field(self.strain_tracker.get_value())
+        # Inverse map of each image pixel: same reference row, X shrunk by the local bulge
+        X_norm = self.a * mid_ratio / (1 + (mid_ratio - 1) * self.bulge)
+        inside = np.abs(X_norm) <= 1
+        position = np.clip((X_norm + 1) / 2, 0, 1) * (gamma.shape[1] - 1)
+        j = np.minimum(position.astype(int), gamma.shape[1] - 2)
+        t = position - j
+        values = (1 - t) * gamma[self.rows, j] + t * gamma[self.rows, j + 1]
+
+        index = np.clip(values / self.strain_scale * 255, 0, 255).astype(np.uint8)
+        rgba = np.empty(values.shape + (4,), dtype=np.uint8)
+        rgba[..., :3] = self.lut[index]
+        rgba[..., 3] = np.where(inside, round(255 * self.opacity), 0)
+        self.pixel_array = rgba
+
+        # The image spans the bounding box of the current outline
+        current_height = self.ref_height * height_ratio
+        self.stretch_to_fit_width(self.ref_width * mid_ratio)
+        self.stretch_to_fit_height(current_height)
+        self.move_to(self.base_point + UP * current_height / 2)
+        return self
+
+    def colorbar(self, height=2, width=0.2):
+        """Vertical colour scale of the maximum shear strain (%) with its end values."""
+        bar = ImageMobject(np.repeat(self.lut[::-1, None, :], 2, axis=1))
+        bar.set_resampling_algorithm(RESAMPLING_ALGORITHMS["bilinear"])
+        bar.stretch_to_fit_height(height).stretch_to_fit_width(width)
+        title = MathTex(r"\gamma_{max}\,(\%)", font_size=24)
+        title.next_to(bar, UP, buff=0.15)
+        top = MathTex(f"{100 * self.strain_scale:.0f}", font_size=20)
+        top.next_to(bar, RIGHT, buff=0.1).align_to(bar, UP)
+        bottom = MathTex("0", font_size=20)
+        bottom.next_to(bar, RIGHT, buff=0.1).align_to(bar, DOWN)
+        return Group(bar, title, top, bottom)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# Golden-frame regression check for the scenes.
+#
+#   python golden_frames.py            # compare against golden/<Scene>/<moment>.png
+#   python golden_frames.py --update   # (re)write the golden images
+#   python -m pytest tests/test_golden_frames.py   # same check, one test per scene
+#
+# Each scene is run with every animation skipped (no frames rendered, no video
+# encoded); only the named moments are rasterized: the start of the section
+# with that name (self.next_section(...) in the scene) and the final frame.
+# Frames are compared with SSIM and a difference hash, so antialiasing noise
+# passes while visible changes fail. The whole suite runs in seconds on a CPU.
+# The golden images are committed under golden/<Scene>/; after an intended
+# visual change, regenerate them with --update (same Manim version and LaTeX
+# setup as the reference environment) and commit them with the change.
+
+import argparse
+import os
+import sys
+
+from manim import *
+import numpy as np
+from PIL import Image
+
+from proxy_render import load_scene_class
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+# Scene name -> (file, named moments)
+GOLDEN_SCENES = {
+    "BrazilianTensileStrengthTest": ("BTS.py", ["peak load", "final frame"]),
+    "CementedClayTriaxialTest": ("triaxial.py", ["peak load", "crack onset", "final frame"]),
+    "ClayTriaxialTest": ("clay_triaxial.py", ["shearing", "final frame"]),
+}
+
+SSIM_THRESHOLD = 0.98
+HASH_DISTANCE_THRESHOLD = 4
+
+
+class GoldenFrameMixin:
+    golden_moments = ()
+
+    def setup(self):
+        super().setup()
+        self.golden_frames = {}
+
+    def snapshot(self, name):
+        # Draw the full current state, ignoring the static image of the last (skipped) animation
+        self.renderer.static_image = None
+        self.renderer.update_frame(self, ignore_skipping=True)
+        self.golden_frames[name] = self.renderer.get_frame()
+
+    def next_section(self, name="unnamed", *args, **kwargs):
+        super().next_section(name, *args, **kwargs)
+        if name in self.golden_moments and name not in self.golden_frames:
+            self.snapshot(name)
+
+    def tear_down(self):
+        super().tear_down()
+        if "final frame" in self.golden_moments:
+            self.snapshot("final frame")
+
+
+def render_moments(file_path, scene_name, moments, quality="low_quality"):
+    """Returns {moment: RGBA frame} for the named moments of a scene, without rendering any animation."""
+    scene_class = load_scene_class(file_path, scene_name)
+    golden_class = type(scene_name, (GoldenFrameMixin, scene_class), {"golden_moments": tuple(moments)})
+    options = {
+        "quality": quality,
+        "input_file": file_path,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+        "preview": False,
+        # Every play() is skipped: only the final state of each animation is computed
+        "from_animation_number": 10 ** 9,
+    }
+    with tempconfig(options):
+        scene = golden_class()
+        scene.render()
+    return scene.golden_frames
+
+
+def ssim(a, b, window=7):
+    """Mean structural similarity of two grayscale images with a uniform window."""
+    a = a.astype(float)
+    b = b.astype(float)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+
+    def box(x):
+        # Mean over every window x window block via a summed-area table
+        s = np.pad(x, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+        return (s[window:, window:] - s[:-window, window:] - s[window:, :-window] + s[:-window, :-window]) / window ** 2
+
+    mu_a, mu_b = box(a), box(b)
+    var_a = box(a * a) - mu_a ** 2
+    var_b = box(b * b) - mu_b ** 2
+    cov = box(a * b) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+
+def difference_hash(image, size=8):
+    """64-bit perceptual difference hash of a PIL image."""
+    small = np.asarray(image.convert("L").resize((size + 1, size), Image.LANCZOS), dtype=float)
+    return (small[:, 1:] > small[:, :-1]).flatten()
+
+
+def compare_frames(frame, golden):
+    """Returns (SSIM, hash distance) between a rendered frame and a golden image."""
+    image = Image.fromarray(frame).convert("RGB")
+    golden = golden.convert("RGB")
+    if image.size != golden.size:
+        image = image.resize(golden.size, Image.LANCZOS)
+    score = ssim(np.asarray(image.convert("L")), np.asarray(golden.convert("L")))
+    distance = int(np.count_nonzero(difference_hash(image) != difference_hash(golden)))
+    return score, distance
+
+
+def golden_path(scene_name, moment):
+    return os.path.join(GOLDEN_DIR, scene_name, moment.replace(" ", "_") + ".png")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sampled scene frames against golden images.")
+    parser.add_argument("scenes", nargs="*", default=list(GOLDEN_SCENES), help="scenes to check (default: all)")
+    parser.add_argument("--update", action="store_true", help="write the rendered frames as the new golden images")
+    args = parser.parse_args(argv)
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    failures = 0
+    for scene_name in args.scenes:
+        file_name, moments = GOLDEN_SCENES[scene_name]
+        if not args.update and not any(os.path.isfile(golden_path(scene_name, moment)) for moment in moments):
+            # Nothing to compare against: skip the render and say how to create the reference
+            print(f"FAIL  {scene_name}: no golden images in {os.path.join(GOLDEN_DIR, scene_name)} "
+                  f"(run 'python golden_frames.py --update {scene_name}' and commit them)")
+            failures += len(moments)
+            continue
+        frames = render_moments(os.path.join(base_dir, file_name), scene_name, moments)
+        for moment in moments:
+            path = golden_path(scene_name, moment)
+            if moment not in frames:
+                print(f"FAIL  {scene_name} / {moment}: moment never reached")
+                failures += 1
+                continue
+            image = Image.fromarray(frames[moment]).convert("RGB")
+            if args.update:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                image.save(path)
+                print(f"wrote {path}")
+                continue
+            if not os.path.isfile(path):
+                print(f"FAIL  {scene_name} / {moment}: no golden image (run with --update)")
+                failures += 1
+                continue
+            score, distance = compare_frames(frames[moment], Image.open(path))
+            ok = score >= SSIM_THRESHOLD and distance <= HASH_DISTANCE_THRESHOLD
+            print(f"{'ok   ' if ok else 'FAIL '} {scene_name} / {moment}: SSIM {score:.4f}, hash distance {distance}")
+            if not ok:
+                failures += 1
+                actual_path = os.path.splitext(path)[0] + ".actual.png"
+                image.save(actual_path)
+                print(f"      rendered frame saved to {actual_path}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
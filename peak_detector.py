@@ -0,0 +1,124 @@
+# Incremental detection of yield, peak, onset of softening and residual plateau
+# on a streaming deviator stress - axial strain (q - epsilon) series.
+#
+# Every sample costs O(1): q and the tangent slope are smoothed with an
+# exponential moving average and each event is only confirmed once its
+# condition has held for a few consecutive samples (hysteresis), so noisy logs
+# do not trigger spurious events. The same detector runs sample by sample inside a scene or
+# over a large offline log through detect_events().
+
+from collections import namedtuple
+
+import numpy as np
+
+Event = namedtuple("Event", ["kind", "index", "strain", "stress"])
+
+EVENT_KINDS = ("yield", "peak", "softening", "residual")
+
+
+class PeakDetector:
+    def __init__(
+        self,
+        smoothing=0.3,        # EMA weight of the newest q and slope sample
+        yield_ratio=0.5,      # yield when the tangent stiffness falls below this fraction of the initial stiffness
+        peak_drop=0.02,       # peak confirmed once q has dropped this fraction below the running maximum
+        softening_ratio=0.05, # softening when the slope is steeper than -softening_ratio * initial stiffness
+        residual_ratio=0.01,  # residual plateau when |slope| stays below residual_ratio * initial stiffness
+        hold=3,               # consecutive samples a condition must hold before it is confirmed
+        min_step=0.0,         # minimum strain increment between slope evaluations (noisy, densely sampled logs)
+    ):
+        self.smoothing = smoothing
+        self.yield_ratio = yield_ratio
+        self.peak_drop = peak_drop
+        self.softening_ratio = softening_ratio
+        self.residual_ratio = residual_ratio
+        self.hold = hold
+        self.min_step = min_step
+        self.reset()
+
+    def reset(self):
+        self.index = -1
+        self.events = {}
+        self.slope = None
+        self.stress = None    # Smoothed q
+        self.initial_stiffness = 0.0
+        self._prev = None
+        self._max = None
+        self._runs = {}
+
+    def _emit(self, kind, sample):
+        event = Event(kind, *sample)
+        self.events[kind] = event
+        return event
+
+    def _hold(self, kind, condition, sample):
+        # Counts consecutive samples that satisfy the pending condition and
+        # reports the sample where the run started once it is long enough
+        if not condition:
+            self._runs.pop(kind, None)
+            return None
+        run = self._runs.setdefault(kind, [sample, 0])
+        run[1] += 1
+        if run[1] >= self.hold:
+            del self._runs[kind]
+            return self._emit(kind, run[0])
+        return None
+
+    def update(self, strain, stress):
+        """Feeds one (strain, q) sample and returns the list of events it confirms."""
+        self.index += 1
+        sample = (self.index, strain, stress)
+        new_events = []
+
+        prev = self._prev
+        if prev is None:
+            self._prev = sample
+            self.stress = stress
+            self._max = sample
+            return new_events
+        if strain - prev[1] <= self.min_step:
+            return new_events
+        self._prev = sample
+
+        # The running maximum follows the smoothed q, so one noisy sample cannot set or end the peak
+        self.stress += self.smoothing * (stress - self.stress)
+        if self.stress > self._max[2]:
+            self._max = (self.index, strain, self.stress)
+
+        raw_slope = (stress - prev[2]) / (strain - prev[1])
+        if self.slope is None:
+            self.slope = raw_slope
+        else:
+            self.slope += self.smoothing * (raw_slope - self.slope)
+
+        events = self.events
+        if "yield" not in events:
+            self.initial_stiffness = max(self.initial_stiffness, self.slope)
+            event = self._hold("yield", self.slope < self.yield_ratio * self.initial_stiffness, prev)
+            if event:
+                new_events.append(event)
+
+        if "peak" not in events:
+            event = self._hold("peak", self.stress < self._max[2] * (1 - self.peak_drop), self._max)
+            if event:
+                new_events.append(event)
+        elif "softening" not in events:
+            event = self._hold("softening", self.slope < -self.softening_ratio * self.initial_stiffness, prev)
+            if event:
+                new_events.append(event)
+        elif "residual" not in events:
+            event = self._hold("residual", abs(self.slope) < self.residual_ratio * self.initial_stiffness, prev)
+            if event:
+                new_events.append(event)
+
+        return new_events
+
+
+def detect_events(strain, stress, **kwargs):
+    """Runs a PeakDetector over a whole q - strain series and returns {kind: Event}."""
+    detector = PeakDetector(**kwargs)
+    update = detector.update
+    for x, q in zip(np.asarray(strain, dtype=float).tolist(), np.asarray(stress, dtype=float).tolist()):
+        update(x, q)
+    return detector.events
+
@@ -0,0 +1,88 @@
+# Small helpers shared by the scenes for drawing precomputed data on Axes.
+
+from manim import *
+import numpy as np
+
+from stress_path import critical_state_q
+
+
+def axes_points(axes, x, y):
+    """Scene points for arrays of (x, y) coordinates on linear Axes, evaluated in one step."""
+    origin = axes.c2p(0, 0)
+    x_unit = axes.c2p(1, 0) - origin
+    y_unit = axes.c2p(0, 1) - origin
+    x = np.asarray(x, dtype=float)[..., None]
+    y = np.asarray(y, dtype=float)[..., None]
+    return origin + x * x_unit + y * y_unit
+
+
+def tracked_curve(axes, x, y, tracker, key, **style):
+    """VMobject drawing the (x, y) path up to the point where key reaches the tracker's value."""
+    # Scene points are computed once; each frame only slices the precomputed array
+    points = axes_points(axes, x, y)
+    key = np.asarray(key, dtype=float)
+    curve = VMobject(**style)
+
+    def update_curve(mob):
+        value = tracker.get_value()
+        k = int(np.searchsorted(key, value, side="right"))
+        visible = points[:max(k, 1)]
+        if 0 < k < len(key) and value > key[k - 1]:
+            # Interpolate the end point between the neighbouring samples
+            t = (value - key[k - 1]) / (key[k] - key[k - 1])
+            visible = np.vstack([visible, points[k - 1] + t * (points[k] - points[k - 1])])
+        if len(visible) < 2:
+            visible = np.vstack([visible, visible])
+        mob.set_points_as_corners(visible)
+
+    update_curve(curve)
+    curve.add_updater(update_curve)
+    return curve
+
+
+def stress_path_panel(p_range, q_range, M, x_length=3, y_length=1.4):
+    """Small p'-q axes with labels and the critical state line q = M p' (axes are panel[0])."""
+    pq_axes = Axes(
+        x_range=p_range,
+        y_range=q_range,
+        x_length=x_length,
+        y_length=y_length,
+        axis_config={"color": WHITE},
+        tips=False
+    )
+    p_label = MathTex("p'", font_size=24)
+    p_label.next_to(pq_axes, DOWN, buff=0.15)
+    q_label = MathTex("q", font_size=24)
+    q_label.next_to(pq_axes, LEFT, buff=0.2)
+
+    # Critical state line, clipped to the panel
+    p_end = min(p_range[1], q_range[1] / M)
+    csl = DashedLine(pq_axes.c2p(0, 0), pq_axes.c2p(p_end, critical_state_q(p_end, M)), color=GRAY, stroke_width=2)
+    csl_label = Text("CSL", font_size=14, color=GRAY)
+    csl_label.next_to(csl.get_end(), RIGHT, buff=0.1)
+    return VGroup(pq_axes, p_label, q_label, csl, csl_label)
+
+
+class HistogramBars(VMobject):
+    def __init__(self, axes, edges, **kwargs):
+        super().__init__(**kwargs)
+        # Every bar is one closed subpath of this single VMobject
+        edges = np.asarray(edges, dtype=float)
+        self.origin = axes.c2p(0, 0)
+        self.y_unit = axes.c2p(0, 1) - self.origin
+        self.max_height = axes.y_range[1]  # Taller bars are cut off at the top of the axes
+        left = axes_points(axes, edges[:-1], 0)
+        right = axes_points(axes, edges[1:], 0)
+        self.base = np.stack([left, left, right, right, left], axis=1)  # corners of each bar at zero height
+        self.raised = np.array([0, 1, 1, 0, 0], dtype=float)            # corners lifted to the bar height
+        self.set_heights(np.zeros(len(edges) - 1))
+
+    def set_heights(self, heights):
+        """Redraws all bars for the given heights (axes y units) in one array update."""
+        heights = np.clip(np.asarray(heights, dtype=float), 0, self.max_height)
+        corners = self.base + heights[:, None, None] * self.raised[None, :, None] * self.y_unit
+        start = corners[:, :-1]
+        end = corners[:, 1:]
+        step = (end - start) / 3
+        self.points = np.stack([start, start + step, end - step, end], axis=2).reshape(-1, 3)
+        return self
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# Proxy-then-final render workflow.
+#
+#   python proxy_render.py record BTS.py BrazilianTensileStrengthTest
+#   python proxy_render.py replay media/proxy/BrazilianTensileStrengthTest.scene.pkl.gz -q h --fps 60
+#
+# The proxy pass renders the scene normally (low quality by default) and
+# records the fully resolved scene description of every frame: the Bezier
+# points, colours and stroke widths of every drawn vectorized mobject, the
+# corners and pixels of every image, plus the layers baked into the
+# background. Identical items are stored once.
+# The final pass replays that description at the target resolution and frame
+# rate without running construct() again, so curve sampling, polygon
+# construction and text compilation are not repeated; frames between two
+# recorded frames are interpolated when their geometry matches and held
+# otherwise. The geometry is kept as Bezier control points, so plots that
+# sample at fixed strain steps replay sharply at any resolution. Scenes that
+# choose their level of detail from the output resolution (curve segments,
+# mesh faces, image sizes) set resolution_dependent_geometry; they are only
+# replayed at the resolution they were recorded at.
+# Caching is disabled for the proxy pass: a cached play() renders no frames,
+# so nothing would be recorded for it. Only scenes drawn by the plain 2D
+# camera can be recorded: points are stored in scene coordinates, without a
+# 3D projection, shading or a moving camera frame.
+
+import argparse
+import gzip
+import hashlib
+import importlib.util
+import inspect
+import os
+import pickle
+import subprocess
+import sys
+
+from manim import *
+import numpy as np
+
+from static_layers import StaticLayerMixin
+
+QUALITIES = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "p": "production_quality", "k": "fourk_quality"}
+
+
+def describe_mobjects(camera, mobjects, items):
+    """Appends every drawn VMobject and image to the items table and returns their keys in drawing order."""
+    keys = []
+    for mob in camera.get_mobjects_to_display(mobjects):
+        if isinstance(mob, AbstractImageMobject):
+            # Images (e.g. the DIC field overlay) keep their corner points and RGBA pixels
+            item = (
+                "image",
+                np.array(mob.points, dtype=float),
+                np.array(mob.get_pixel_array(), dtype=np.uint8),
+                int(mob.resampling_algorithm),
+            )
+        elif isinstance(mob, VMobject):
+            if len(mob.points) == 0:
+                continue
+            item = (
+                np.array(mob.points, dtype=float),
+                np.array(mob.get_fill_rgbas(), dtype=float),
+                np.array(mob.get_stroke_rgbas(), dtype=float),
+                float(mob.get_stroke_width()),
+                np.array(mob.get_stroke_rgbas(background=True), dtype=float),
+                float(mob.get_stroke_width(background=True)),
+                float(mob.get_sheen_factor()),
+                np.array(mob.get_sheen_direction(), dtype=float),
+            )
+        elif isinstance(mob, PMobject):
+            raise TypeError(f"{type(mob).__name__} is drawn but cannot be recorded (only VMobjects and images are)")
+        else:
+            continue  # Plain mobjects (groups, value trackers) draw nothing
+        digest = hashlib.sha1()
+        for value in item:
+            digest.update(np.asarray(value).tobytes())
+        key = digest.hexdigest()
+        items.setdefault(key, item)
+        keys.append(key)
+    return keys
+
+
+class RecordingMixin:
+    # Where the scene description is written (defaults to <media_dir>/proxy/<SceneName>.scene.pkl.gz)
+    record_path = None
+
+    def setup(self):
+        super().setup()
+        if type(self.camera) is not Camera:
+            raise TypeError(
+                f"{self.recording_name()} is drawn by a {type(self.camera).__name__}, whose view is not recorded"
+            )
+        self.recording = {
+            "scene": self.recording_name(),
+            "input_file": str(config.input_file),
+            "fps": config.frame_rate,
+            "resolution": (config.pixel_width, config.pixel_height),
+            "items": {},
+            "backgrounds": [[]],
+            "frames": [],
+        }
+        self._recorded_baked = 0
+        renderer_add_frame = self.renderer.add_frame
+
+        def add_frame(frame, num_frames=1):
+            self.record_frame(num_frames)
+            renderer_add_frame(frame, num_frames)
+
+        self.renderer.add_frame = add_frame
+
+    def recording_name(self):
+        return type(self).__name__.replace("Recorded", "", 1)
+
+    def record_frame(self, num_frames):
+        recording = self.recording
+        baked = getattr(self, "baked_mobjects", [])
+        if len(baked) > self._recorded_baked:
+            new_layers = baked[self._recorded_baked:]
+            recording["backgrounds"].append(describe_mobjects(self.camera, new_layers, recording["items"]))
+            self._recorded_baked = len(baked)
+        mobjects = list_update(self.mobjects, self.foreground_mobjects)
+        keys = describe_mobjects(self.camera, mobjects, recording["items"])
+        recording["frames"].append((num_frames, len(recording["backgrounds"]) - 1, keys))
+
+    def tear_down(self):
+        super().tear_down()
+        self.recording["resolution_dependent"] = getattr(self, "resolution_dependent_geometry", False)
+        path = self.record_path or os.path.join(
+            config.get_dir("media_dir"), "proxy", self.recording["scene"] + ".scene.pkl.gz"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with gzip.open(path, "wb") as f:
+            pickle.dump(self.recording, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Scene description recorded to {path}")
+
+
+def load_recording(path):
+    with gzip.open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def is_image_item(item):
+    return isinstance(item[0], str) and item[0] == "image"
+
+
+def build_vmobject(item, mob=None):
+    """Sets a VMobject (new or reused) to a recorded item."""
+    if mob is None:
+        mob = VMobject()
+    points, fill, stroke, stroke_width, background_stroke, background_stroke_width, sheen_factor, sheen_direction = item
+    mob.points = points
+    mob.fill_rgbas = fill
+    mob.stroke_rgbas = stroke
+    mob.stroke_width = stroke_width
+    mob.background_stroke_rgbas = background_stroke
+    mob.background_stroke_width = background_stroke_width
+    mob.sheen_factor = sheen_factor
+    mob.sheen_direction = sheen_direction
+    return mob
+
+
+def build_image_mobject(item, mob=None):
+    """Sets an ImageMobject (new or reused) to a recorded image item."""
+    _, points, pixels, resampling_algorithm = item
+    if mob is None:
+        mob = ImageMobject(pixels)
+    mob.pixel_array = pixels
+    mob.points = points
+    mob.set_resampling_algorithm(resampling_algorithm)
+    return mob
+
+
+def build_mobject(item):
+    return build_image_mobject(item) if is_image_item(item) else build_vmobject(item)
+
+
+def items_match(a, b):
+    """True when two recorded items are of the same kind with the same array shapes."""
+    if is_image_item(a) or is_image_item(b):
+        return is_image_item(a) and is_image_item(b) and a[2].shape == b[2].shape
+    return a[0].shape == b[0].shape and a[1].shape == b[1].shape and a[2].shape == b[2].shape
+
+
+def interpolate_items(start, end, alpha):
+    """Blends two recorded items with the same array shapes."""
+    if is_image_item(start):
+        # Corners move linearly and the pixels cross-fade
+        kind, points, pixels, resampling_algorithm = start
+        blended = ((1 - alpha) * pixels + alpha * end[2]).round().astype(np.uint8)
+        return kind, (1 - alpha) * points + alpha * end[1], blended, resampling_algorithm
+    return tuple(
+        (1 - alpha) * a + alpha * b if isinstance(a, (float, np.ndarray)) else a
+        for a, b in zip(start, end)
+    )
+
+
+class ReplayFrames(Animation):
+    def __init__(self, holder, frames, items, fps, **kwargs):
+        self.frames = frames
+        self.items = items
+        self.frame_times = np.cumsum([0] + [num_frames for num_frames, _, _ in frames]) / fps
+        self.pool = []
+        self.image_pool = []
+        super().__init__(holder, run_time=max(self.frame_times[-1], 1 / fps), rate_func=linear, **kwargs)
+
+    def frame_items(self, t):
+        k = min(int(np.searchsorted(self.frame_times, t, side="right")) - 1, len(self.frames) - 1)
+        num_frames, _, keys = self.frames[k]
+        current = [self.items[key] for key in keys]
+        if num_frames > 1 or k + 1 >= len(self.frames):
+            return current
+        next_keys = self.frames[k + 1][2]
+        if len(next_keys) != len(keys):
+            return current
+        upcoming = [self.items[key] for key in next_keys]
+        if not all(items_match(a, b) for a, b in zip(current, upcoming)):
+            return current
+        alpha = (t - self.frame_times[k]) / (self.frame_times[k + 1] - self.frame_times[k])
+        return [a if ka == kb else interpolate_items(a, b, alpha)
+                for a, b, ka, kb in zip(current, upcoming, keys, next_keys)]
+
+    def interpolate_mobject(self, alpha):
+        current = self.frame_items(alpha * self.frame_times[-1])
+        # VMobjects and images are reused from separate pools, in drawing order
+        n_images = sum(is_image_item(item) for item in current)
+        while len(self.pool) < len(current) - n_images:
+            self.pool.append(VMobject())
+        while len(self.image_pool) < n_images:
+            self.image_pool.append(ImageMobject(np.zeros((1, 1, 4), dtype=np.uint8)))
+        vmobjects = iter(self.pool)
+        images = iter(self.image_pool)
+        submobjects = [
+            build_image_mobject(item, next(images)) if is_image_item(item) else build_vmobject(item, next(vmobjects))
+            for item in current
+        ]
+        self.mobject.submobjects = submobjects
+
+
+class ReplayScene(StaticLayerMixin, Scene):
+    record_path = None
+
+    def construct(self):
+        recording = load_recording(self.record_path)
+        items = recording["items"]
+        frames = recording["frames"]
+        holder = Group()  # VMobjects and images
+        self.add(holder)
+
+        baked_version = 0
+        start = 0
+        while start < len(frames):
+            # Frames sharing the same baked background are replayed as one animation
+            version = frames[start][1]
+            end = start
+            while end < len(frames) and frames[end][1] == version:
+                end += 1
+            for layer in recording["backgrounds"][baked_version + 1:version + 1]:
+                self.bake_static(*[build_mobject(items[key]) for key in layer])
+            baked_version = max(baked_version, version)
+            self.play(ReplayFrames(holder, frames[start:end], items, recording["fps"]))
+            start = end
+
+
+def load_scene_class(file_path, scene_name):
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(file_path))[0], file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(file_path)))
+    spec.loader.exec_module(module)
+    scene_class = getattr(module, scene_name)
+    if not (inspect.isclass(scene_class) and issubclass(scene_class, Scene)):
+        raise TypeError(f"{scene_name} is not a Scene in {file_path}")
+    return scene_class
+
+
+def record(file_path, scene_name, quality, fps=None, output=None):
+    """Proxy pass: renders the scene and records its per-frame description."""
+    scene_class = load_scene_class(file_path, scene_name)
+    if issubclass(scene_class, ThreeDScene):
+        # Projection, shading and fixed-in-frame mobjects depend on the 3D camera
+        raise TypeError(f"{scene_name} is a ThreeDScene and cannot be recorded; render it directly")
+    recorded = type("Recorded" + scene_name, (RecordingMixin, scene_class), {"record_path": output})
+    options = {"quality": QUALITIES[quality], "input_file": file_path, "output_file": scene_name, "disable_caching": True}
+    if fps:
+        options["frame_rate"] = fps
+    with tempconfig(options):
+        recorded().render()
+
+
+def replay(record_path, quality, fps=None):
+    """Final pass: rasterizes a recorded scene description at the target resolution and frame rate."""
+    recording = load_recording(record_path)
+    scene_class = type(recording["scene"], (ReplayScene,), {"record_path": record_path})
+    options = {"quality": QUALITIES[quality], "input_file": recording["input_file"], "output_file": recording["scene"]}
+    if fps:
+        options["frame_rate"] = fps
+    with tempconfig(options):
+        resolution = (config.pixel_width, config.pixel_height)
+        recorded_resolution = tuple(recording.get("resolution", resolution))
+        if recording.get("resolution_dependent") and resolution != recorded_resolution:
+            raise ValueError(
+                f"{recording['scene']} picks its level of detail for the output resolution; it was recorded at "
+                f"{recorded_resolution[0]}x{recorded_resolution[1]} and cannot be replayed at "
+                f"{resolution[0]}x{resolution[1]} (record the proxy at the final quality instead)"
+            )
+        scene_class().render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a proxy render and replay it at the final quality.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="proxy render that records the scene description")
+    record_parser.add_argument("file")
+    record_parser.add_argument("scene")
+    record_parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    record_parser.add_argument("--fps", type=float, help="proxy frame rate (defaults to the quality's)")
+    record_parser.add_argument("-o", "--output", help="path of the recorded description")
+
+    replay_parser = commands.add_parser("replay", help="final render from a recorded description")
+    replay_parser.add_argument("recording")
+    replay_parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    replay_parser.add_argument("--fps", type=float, help="target frame rate (defaults to the quality's)")
+    replay_parser.add_argument("--background", action="store_true", help="run the final pass as a detached process")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.file, args.scene, args.quality, args.fps, args.output)
+    elif args.background:
+        command = [sys.executable, os.path.abspath(__file__), "replay", args.recording, "-q", args.quality]
+        if args.fps:
+            command += ["--fps", str(args.fps)]
+        log_path = os.path.splitext(args.recording)[0] + ".replay.log"
+        with open(log_path, "w") as log:
+            process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        print(f"Final render running in the background (pid {process.pid}), log in {log_path}")
+    else:
+        replay(args.recording, args.quality, args.fps)
+
+
+if __name__ == '__main__':
+    main()
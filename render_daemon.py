@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# Warm render server for the edit-preview loop.
+#
+#   python render_daemon.py serve                       # keep Manim and the scenes loaded
+#   python render_daemon.py submit BTS.py BrazilianTensileStrengthTest -q l -p
+#
+# The server imports Manim, warms up the text and LaTeX pipelines and imports
+# the scene modules once. It watches the scene files and, when one changes,
+# reloads only that module and re-renders the scenes last requested from it
+# (none until a scene of that module has been submitted).
+# Jobs are JSON lines sent over a local TCP socket; renders run one at a time
+# on the main thread because Manim's config is global.
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+from manim import *
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENE_MODULES = ["BTS", "triaxial", "clay_triaxial"]
+QUALITIES = {"l": "low_quality", "m": "medium_quality", "h": "high_quality", "p": "production_quality", "k": "fourk_quality"}
+DEFAULT_PORT = 8765
+
+
+def module_name(name):
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def scene_classes(module):
+    """Scene subclasses defined in the module itself (not imported into it)."""
+    return {
+        name: cls for name, cls in vars(module).items()
+        if inspect.isclass(cls) and issubclass(cls, Scene) and cls.__module__ == module.__name__
+    }
+
+
+class RenderTCPServer(socketserver.ThreadingTCPServer):
+    # Restarting the server must not wait for the old socket to leave TIME_WAIT
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class RenderServer:
+    def __init__(self, modules=SCENE_MODULES, watch_interval=0.5):
+        if BASE_DIR not in sys.path:
+            sys.path.insert(0, BASE_DIR)
+        self.jobs = queue.Queue()
+        self.watch_interval = watch_interval
+        self.modules = {name: importlib.import_module(name) for name in modules}
+        self.mtimes = {name: os.path.getmtime(module.__file__) for name, module in self.modules.items()}
+        # Scenes last rendered from each module, with their options, re-rendered on change
+        self.recent = {name: {} for name in modules}
+
+    def warm_up(self):
+        # Font loading and the LaTeX toolchain are paid once here instead of in every render
+        with tempconfig({"quality": "low_quality"}):
+            Text("warm up", font_size=12)
+            MathTex(r"\frac{2P}{\pi D T}")
+
+    def watch(self):
+        while True:
+            time.sleep(self.watch_interval)
+            for name, module in self.modules.items():
+                try:
+                    mtime = os.path.getmtime(module.__file__)
+                except OSError:
+                    continue  # Editors may briefly remove the file while saving
+                if mtime != self.mtimes[name]:
+                    self.mtimes[name] = mtime
+                    self.jobs.put({"action": "reload", "module": name})
+
+    def render(self, module, scene, quality="l", preview=False):
+        module = self.modules[module]
+        scene_class = scene_classes(module)[scene]
+        options = {"quality": QUALITIES[quality], "preview": preview, "input_file": module.__file__}
+        start = time.perf_counter()
+        with tempconfig(options):
+            instance = scene_class()
+            instance.render()
+            output = getattr(instance.renderer.file_writer, "movie_file_path", None)
+        return {"status": "ok", "scene": scene, "output": str(output), "seconds": round(time.perf_counter() - start, 3)}
+
+    def reload(self, name):
+        logger.info(f"{name}.py changed, reloading")
+        self.modules[name] = importlib.reload(self.modules[name])
+        # Nothing is rendered for a module until one of its scenes has been requested
+        return [self.render(name, scene, **options) for scene, options in self.recent[name].items()]
+
+    def run_job(self, job):
+        try:
+            if job["action"] == "reload":
+                return {"status": "ok", "renders": self.reload(job["module"])}
+            name = module_name(job["module"])
+            if name not in self.modules:
+                return {"status": "error", "error": f"unknown module {name}"}
+            options = {"quality": job.get("quality", "l"), "preview": job.get("preview", False)}
+            self.recent[name][job["scene"]] = options
+            return self.render(name, job["scene"], **options)
+        except Exception:
+            return {"status": "error", "error": traceback.format_exc()}
+
+    def serve(self, port=DEFAULT_PORT):
+        self.warm_up()
+        jobs = self.jobs
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    job = json.loads(line)
+                except ValueError as error:
+                    return self.reply({"status": "error", "error": f"malformed job: {error}"})
+                if not isinstance(job, dict):
+                    return self.reply({"status": "error", "error": "malformed job: expected a JSON object"})
+                job.setdefault("action", "render")
+                job["reply"] = queue.Queue(maxsize=1)
+                jobs.put(job)
+                self.reply(job["reply"].get())
+
+            def reply(self, result):
+                self.wfile.write((json.dumps(result) + "\n").encode())
+
+        server = RenderTCPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        threading.Thread(target=self.watch, daemon=True).start()
+        logger.info(f"Render server ready on 127.0.0.1:{port}, watching {', '.join(self.modules)}")
+
+        try:
+            while True:
+                job = jobs.get()
+                result = self.run_job(job)
+                if "reply" in job:
+                    job["reply"].put(result)
+                else:
+                    logger.info(json.dumps(result))
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+def submit(module, scene, quality="l", preview=False, port=DEFAULT_PORT):
+    """Sends one render job to a running server and returns its JSON reply."""
+    job = {"action": "render", "module": module, "scene": scene, "quality": quality, "preview": preview}
+    with socket.create_connection(("127.0.0.1", port)) as connection:
+        connection.sendall((json.dumps(job) + "\n").encode())
+        reply = connection.makefile("r").readline()
+    return json.loads(reply)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived Manim render server with file watching.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="start the render server")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--modules", nargs="+", default=SCENE_MODULES, help="scene modules to preload and watch")
+    serve_parser.add_argument("--interval", type=float, default=0.5, help="file watch interval in seconds")
+
+    submit_parser = commands.add_parser("submit", help="render a scene on a running server")
+    submit_parser.add_argument("module", help="scene module or file, e.g. BTS.py")
+    submit_parser.add_argument("scene")
+    submit_parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    submit_parser.add_argument("-p", "--preview", action="store_true")
+    submit_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        RenderServer([module_name(name) for name in args.modules], args.interval).serve(args.port)
+    else:
+        reply = submit(args.module, args.scene, args.quality, args.preview, args.port)
+        print(reply.get("error") or f"{reply['scene']} rendered in {reply['seconds']} s: {reply['output']}")
+        sys.exit(0 if reply["status"] == "ok" else 1)
+
+
+if __name__ == '__main__':
+    main()
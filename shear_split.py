@@ -0,0 +1,69 @@
+# Splitting a specimen outline along an inclined shear plane and moving the
+# pieces as rigid bodies.
+#
+# Everything works directly on (N, 3) point arrays: the polygon is clipped by
+# the plane with vectorized signed distances, and rigid motions are 4x4
+# homogeneous matrices that can be precomputed once and applied to the Bezier
+# points of a piece without copying or rebuilding the mobject.
+
+import numpy as np
+
+
+def mohr_coulomb_angle(phi_degrees):
+    """Inclination of the failure plane to the major principal plane, 45 + phi/2 (degrees)."""
+    return 45 + phi_degrees / 2
+
+
+def plane_normal(angle_degrees):
+    """Upward unit normal of a plane descending to the right at the given angle."""
+    theta = np.radians(angle_degrees)
+    return np.array([np.sin(theta), np.cos(theta), 0.0])
+
+
+def split_polygon(vertices, point, angle_degrees):
+    """Clips a convex polygon along a plane through point; returns (upper, lower, crack_start, crack_end)."""
+    vertices = np.asarray(vertices, dtype=float)
+    if vertices.shape[1] == 2:
+        vertices = np.column_stack([vertices, np.zeros(len(vertices))])
+    point = np.asarray(point, dtype=float)
+    if point.shape == (2,):
+        point = np.append(point, 0.0)
+    normal = plane_normal(angle_degrees)
+    distances = (vertices - point) @ normal
+
+    next_vertices = np.roll(vertices, -1, axis=0)
+    next_distances = np.roll(distances, -1)
+    crossing = (distances > 0) != (next_distances > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(crossing, distances / (distances - next_distances), 0.0)
+    intersections = vertices + t[:, None] * (next_vertices - vertices)
+
+    def clip(keep):
+        # Sutherland-Hodgman: each edge contributes its start vertex (if kept) and its crossing point
+        candidates = np.stack([vertices, intersections], axis=1).reshape(-1, 3)
+        mask = np.column_stack([keep, crossing]).reshape(-1)
+        return candidates[mask]
+
+    crack = intersections[crossing]
+    if len(crack) != 2:
+        raise ValueError("the shear plane does not cut the polygon")
+    crack = crack[np.argsort(crack[:, 0])]
+    return clip(distances > 0), clip(distances <= 0), crack[0], crack[1]
+
+
+def rigid_motion_matrix(angle=0.0, shift=(0, 0, 0), about=(0, 0, 0)):
+    """4x4 homogeneous matrix rotating by angle (radians, about the z axis through about) then shifting."""
+    c, s = np.cos(angle), np.sin(angle)
+    about = np.asarray(about, dtype=float)
+    rotation = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation
+    matrix[:3, 3] = about - rotation @ about + np.asarray(shift, dtype=float)
+    return matrix
+
+
+def apply_rigid_motion(points, matrix, out=None):
+    """Applies a homogeneous rigid-motion matrix to an (N, 3) point array."""
+    result = np.matmul(points, matrix[:3, :3].T, out=out)
+    result += matrix[:3, 3]
+    return result
@@ -0,0 +1,78 @@
+# Static layers baked into a cached background raster (Cairo renderer).
+#
+# Mobjects that no longer change once they are on screen (cell outline, water,
+# base, axes with tick labels, watermark, disk and platens, ...) are rasterized
+# once into the camera background and removed from the scene, so every later
+# frame only redraws the moving mobjects on top of a copy of that background.
+# A bake is a single capture_mobjects() call, so baked backgrounds are only
+# kept in a small in-memory cache (the most recent BACKGROUND_CACHE_SIZE, per
+# resolution through the key): re-renders of an unchanged scene in the same
+# process (render_daemon.py) reuse them, and memory stays bounded when every
+# edit bakes new layers.
+
+from collections import OrderedDict
+import hashlib
+
+from manim import *
+import numpy as np
+
+BACKGROUND_CACHE_SIZE = 8
+_background_cache = OrderedDict()
+
+
+def _layer_digest(mobjects, digest):
+    for mobject in mobjects:
+        for mob in mobject.family_members_with_points():
+            digest.update(type(mob).__name__.encode())
+            digest.update(np.ascontiguousarray(mob.points, dtype=float).tobytes())
+            if isinstance(mob, VMobject):
+                for rgbas in (mob.get_fill_rgbas(), mob.get_stroke_rgbas(), mob.get_stroke_rgbas(background=True)):
+                    digest.update(np.ascontiguousarray(rgbas, dtype=float).tobytes())
+                digest.update(repr((mob.get_stroke_width(), mob.get_stroke_width(background=True), mob.z_index)).encode())
+            elif hasattr(mob, "pixel_array"):
+                digest.update(np.ascontiguousarray(mob.pixel_array).tobytes())
+            else:
+                digest.update(repr((mob.color, mob.z_index)).encode())
+    return digest.hexdigest()
+
+
+class StaticLayerMixin:
+    # Set to False to draw every mobject on every frame (e.g. to compare output)
+    bake_static_layers = True
+
+    def setup(self):
+        super().setup()
+        self.baked_mobjects = []
+        self._background_key = repr((
+            config.pixel_width, config.pixel_height, config.frame_width, config.frame_height,
+            str(config.background_color), config.background_opacity,
+        ))
+
+    def bake_static(self, *mobjects):
+        """Rasterizes mobjects into the camera background and removes them from the scene."""
+        camera = self.camera
+        if not self.bake_static_layers or getattr(camera, "pixel_array", None) is None:
+            # Renderer without a raster background (OpenGL): keep drawing them normally
+            return
+
+        key = _layer_digest(mobjects, hashlib.sha1(self._background_key.encode()))
+        background = _background_cache.get(key)
+        if background is None:
+            # Draw the layer on top of the current background
+            camera.reset()
+            camera.capture_mobjects(list(mobjects))
+            background = camera.pixel_array.copy()
+            _background_cache[key] = background
+            if len(_background_cache) > BACKGROUND_CACHE_SIZE:
+                _background_cache.popitem(last=False)
+        else:
+            _background_cache.move_to_end(key)
+
+        camera.background = background
+        camera.reset()
+        self._background_key = key
+        # Manim's partial movie hash skips the camera background but covers its other attributes:
+        # every later play() hashes differently when a baked layer changes
+        camera.static_layer_key = key
+        self.baked_mobjects.extend(mobjects)
+        self.remove(*mobjects)
@@ -0,0 +1,463 @@
+# Single-pass streaming encoder for the Cairo renderer.
+#
+#   STREAM_ENCODE=1 manim -pql clay_triaxial.py ClayTriaxialTest
+#   EXPORT_FORMATS=mp4,webm,gif,poster,thumbnails manim -pqh BTS.py BrazilianTensileStrengthTest
+#
+# By default Manim encodes every play()/wait() into its own partial movie file
+# and concatenates them at the end; the stage loops of the triaxial scenes
+# produce well over a hundred of them. In streaming mode every frame of the
+# scene is encoded into one persistent PyAV container instead (no ffmpeg
+# executable needed), and sections only survive as metadata
+# (<movie>.sections.json with their start frames). Sound added with
+# add_sound() is muxed into the movie at the end.
+#
+# EXPORT_FORMATS fans the same frames out to several sinks running in their
+# own threads: extra video encoders (webm, mov), a looping GIF whose palette is
+# generated from a sample of the frames, a poster frame (POSTER_TIME seconds,
+# default the last frame) and evenly spaced thumbnails. Every format comes
+# from one rasterization pass.
+#
+# The environment is read when each render starts, so a long-lived process
+# (render_daemon.py) follows changes to STREAM_ENCODE and EXPORT_FORMATS.
+# The writer hooks follow the SceneFileWriter of Manim 0.19 and 0.20; other
+# versions (and PNG/GIF output, -s, --save_sections) use Manim's own writer.
+
+import json
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+
+import av
+import manim
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import AudioSegment, SceneFileWriter, convert_audio, to_av_frame_rate
+from manim.utils.file_ops import is_gif_format, write_to_movie
+import numpy as np
+from PIL import Image
+
+VIDEO_FORMATS = ("mp4", "mov", "webm")
+
+# Manim versions whose SceneFileWriter matches the overridden hooks: [first, last)
+SUPPORTED_MANIM = ((0, 19), (0, 21))
+
+
+def manim_version_supported(version=None):
+    numbers = tuple(int(part) for part in re.findall(r"\d+", version or manim.__version__)[:2])
+    return SUPPORTED_MANIM[0] <= numbers < SUPPORTED_MANIM[1]
+
+
+def video_stream_settings(extension, transparent=False):
+    """(codec, pixel format, codec options) of the PyAV video stream for a movie extension."""
+    if extension == ".webm":
+        # Constant quality VP9 (auto-alt-ref frames do not support the alpha plane)
+        return "libvpx-vp9", "yuva420p" if transparent else "yuv420p", {"crf": "32", "b": "0"}
+    if extension == ".mov":
+        # Lossless with alpha, for editing
+        return "qtrle", "argb", {}
+    return "libx264", "yuv420p", {"crf": "23"}
+
+
+def rgba_frame(frame, pts=None, time_base=None):
+    av_frame = av.VideoFrame.from_ndarray(np.ascontiguousarray(frame), format="rgba")
+    if pts is not None:
+        av_frame.pts = pts
+        av_frame.time_base = time_base
+    return av_frame
+
+
+class VideoEncoder:
+    def __init__(self, path, width, height, fps, transparent=False):
+        codec, pix_fmt, options = video_stream_settings(os.path.splitext(path)[1].lower(), transparent)
+        self.path = path
+        self.container = av.open(path, mode="w")
+        self.stream = self.container.add_stream(codec, rate=to_av_frame_rate(fps), options=options)
+        self.stream.pix_fmt = pix_fmt
+        self.stream.width = width
+        self.stream.height = height
+
+    def write(self, frame, num_frames=1):
+        for _ in range(num_frames):
+            # A new VideoFrame per repeat: encoders keep a reference to the frames they were given
+            for packet in self.stream.encode(rgba_frame(frame)):
+                self.container.mux(packet)
+
+    def close(self):
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+class FrameSink:
+    # Consumes frames on its own thread so that all sinks encode concurrently
+    def __init__(self, path):
+        self.path = path
+        self.error = None
+        self.queue = queue.Queue(maxsize=16)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def put(self, frame, num_frames):
+        self.queue.put((frame, num_frames))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is None:
+                try:
+                    self.consume(*item)
+                except Exception as error:
+                    self.error = error
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is None:
+            self.finish()
+        if self.error is not None:
+            raise self.error
+
+    def consume(self, frame, num_frames):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+
+class VideoSink(FrameSink):
+    def __init__(self, path, fps, transparent=False):
+        self.fps = fps
+        self.transparent = transparent
+        self.encoder = None
+        super().__init__(path)
+
+    def consume(self, frame, num_frames):
+        if self.encoder is None:
+            # The encoder starts with the first frame, so its size always matches the camera
+            height, width = frame.shape[:2]
+            self.encoder = VideoEncoder(self.path, width, height, self.fps, self.transparent)
+        self.encoder.write(frame, num_frames)
+
+    def finish(self):
+        if self.encoder is not None:
+            self.encoder.close()
+
+
+def pull_frames(sink):
+    """Frames the filter graph can output so far."""
+    while True:
+        try:
+            yield sink.pull()
+        except (av.error.BlockingIOError, av.error.EOFError):
+            return
+
+
+class GifSink(FrameSink):
+    def __init__(self, path, fps, gif_fps=15, width=480, palette_samples=32):
+        self.frame_time = 1 / fps
+        self.gif_fps = min(gif_fps, fps)
+        self.width = width
+        self.palette_samples = palette_samples
+        self.clock = 0.0
+        self.next_time = 0.0
+        self.stride = None
+        self.shape = None
+        self.samples = []
+        self.sample_every = 1
+        self.spooled = 0
+        self.spool = tempfile.NamedTemporaryFile(suffix=".rgba", delete=False)
+        super().__init__(path)
+
+    def consume(self, frame, num_frames):
+        if self.stride is None:
+            # Integer subsampling to roughly the GIF width, done once per kept frame
+            self.stride = max(1, int(np.ceil(frame.shape[1] / self.width)))
+        small = np.ascontiguousarray(frame[::self.stride, ::self.stride])
+        self.shape = small.shape
+        for _ in range(num_frames):
+            if self.clock + 1e-9 >= self.next_time:
+                self.spool.write(small.tobytes())
+                if self.spooled % self.sample_every == 0:
+                    self.samples.append(small)
+                    if len(self.samples) >= 2 * self.palette_samples:
+                        # Keep the palette sample bounded and evenly spread over the scene
+                        self.samples = self.samples[::2]
+                        self.sample_every *= 2
+                self.spooled += 1
+                self.next_time += 1 / self.gif_fps
+            self.clock += self.frame_time
+
+    def palette(self, time_base):
+        """256-colour palette frame generated from the frame sample."""
+        height, width = self.shape[:2]
+        graph = av.filter.Graph()
+        source = graph.add_buffer(width=width, height=height, format="rgba", time_base=time_base)
+        palettegen = graph.add("palettegen", "stats_mode=full")
+        sink = graph.add("buffersink")
+        source.link_to(palettegen)
+        palettegen.link_to(sink)
+        graph.configure()
+        for pts, sample in enumerate(self.samples):
+            source.push(rgba_frame(sample, pts, time_base))
+        source.push(None)
+        return sink.pull()
+
+    def finish(self):
+        self.spool.close()
+        try:
+            if not self.spooled:
+                return
+            height, width = self.shape[:2]
+            time_base = 1 / to_av_frame_rate(self.gif_fps)
+            palette = self.palette(time_base)
+
+            # Spooled frames are mapped to the palette one at a time (paletteuse keeps the single palette frame)
+            graph = av.filter.Graph()
+            source = graph.add_buffer(width=width, height=height, format="rgba", time_base=time_base)
+            palette_source = graph.add_buffer(
+                width=palette.width, height=palette.height, format=palette.format.name, time_base=time_base
+            )
+            paletteuse = graph.add("paletteuse", "dither=sierra2_4a")
+            sink = graph.add("buffersink")
+            source.link_to(paletteuse, 0, 0)
+            palette_source.link_to(paletteuse, 0, 1)
+            paletteuse.link_to(sink)
+            graph.configure()
+            palette.pts = 0
+            palette.time_base = time_base
+            palette_source.push(palette)
+            palette_source.push(None)
+
+            with av.open(self.path, mode="w") as container:
+                stream = container.add_stream("gif", rate=to_av_frame_rate(self.gif_fps))
+                stream.pix_fmt = "pal8"
+                stream.width = width
+                stream.height = height
+                frames_written = 0
+
+                def mux(frames):
+                    nonlocal frames_written
+                    for frame in frames:
+                        frame.pts = frames_written
+                        frames_written += 1
+                        container.mux(stream.encode(frame))
+
+                frame_bytes = int(np.prod(self.shape))
+                with open(self.spool.name, "rb") as spool:
+                    for pts in range(self.spooled):
+                        frame = np.frombuffer(spool.read(frame_bytes), dtype=np.uint8).reshape(self.shape)
+                        source.push(rgba_frame(frame, pts, time_base))
+                        mux(pull_frames(sink))
+                source.push(None)
+                mux(pull_frames(sink))
+                container.mux(stream.encode())
+        finally:
+            os.remove(self.spool.name)
+
+
+class PosterSink(FrameSink):
+    def __init__(self, path, fps, poster_time=None):
+        self.frame_time = 1 / fps
+        self.poster_time = poster_time
+        self.clock = 0.0
+        self.poster = None
+        super().__init__(path)
+
+    def consume(self, frame, num_frames):
+        if self.poster_time is None or self.clock <= self.poster_time + 1e-9:
+            self.poster = frame
+        self.clock += num_frames * self.frame_time
+
+    def finish(self):
+        if self.poster is not None:
+            Image.fromarray(self.poster).save(self.path)
+
+
+class ThumbnailSink(FrameSink):
+    def __init__(self, path, fps, count=6, width=320, interval=0.5):
+        self.frame_time = 1 / fps
+        self.count = count
+        self.width = width
+        self.interval = interval
+        self.clock = 0.0
+        self.next_time = 0.0
+        self.candidates = []
+        super().__init__(path)
+
+    def consume(self, frame, num_frames):
+        # Candidates every interval seconds; the final pick needs the total length
+        if self.clock + 1e-9 >= self.next_time:
+            image = Image.fromarray(frame)
+            image.thumbnail((self.width, self.width))
+            self.candidates.append(image)
+            self.next_time += self.interval
+        self.clock += num_frames * self.frame_time
+
+    def finish(self):
+        if not self.candidates:
+            return
+        picks = np.unique(np.linspace(0, len(self.candidates) - 1, self.count).round().astype(int))
+        base = os.path.splitext(self.path)[0]
+        for n, index in enumerate(picks, start=1):
+            self.candidates[index].save(f"{base}_{n:02d}.png")
+
+
+def export_formats():
+    return [name.strip().lower() for name in os.environ.get("EXPORT_FORMATS", "").split(",") if name.strip()]
+
+
+def streaming_requested():
+    return os.environ.get("STREAM_ENCODE", "0") not in ("", "0") or bool(export_formats())
+
+
+class StreamingFileWriter(SceneFileWriter):
+    def __init__(self, renderer, scene_name, **kwargs):
+        self.sinks = None
+        self.frames_written = 0
+        self.section_markers = []
+        super().__init__(renderer, scene_name, **kwargs)
+
+    # No partial movie files: nothing to register, hash or look up in the cache
+    def add_partial_movie_file(self, hash_animation):
+        pass
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        pass
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def next_section(self, name, type_, skip_animations):
+        super().next_section(name, type_, skip_animations)
+        self.section_markers.append({
+            "name": name,
+            "type": str(type_),
+            "skip_animations": skip_animations,
+            "start_frame": self.frames_written,
+            "start_time": self.frames_written / config.frame_rate,
+        })
+
+    def create_sinks(self):
+        movie_path = str(self.movie_file_path)
+        base, extension = os.path.splitext(movie_path)
+        fps = config.frame_rate
+        sinks = [VideoSink(movie_path, fps, config.transparent)]
+        for name in export_formats():
+            if name in VIDEO_FORMATS and "." + name != extension:
+                sinks.append(VideoSink(f"{base}.{name}", fps, config.transparent))
+            elif name == "gif":
+                sinks.append(GifSink(base + ".gif", fps))
+            elif name == "poster":
+                poster_time = os.environ.get("POSTER_TIME")
+                sinks.append(PosterSink(base + "_poster.png", fps, float(poster_time) if poster_time else None))
+            elif name == "thumbnails":
+                sinks.append(ThumbnailSink(base + "_thumb.png", fps))
+            elif name not in VIDEO_FORMATS:
+                logger.warning(f"Unknown export format {name!r} ignored")
+        return sinks
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not write_to_movie():
+            # Image sequences (--format png) are written by Manim's writer
+            super().write_frame(frame_or_renderer, num_frames)
+            return
+        frame = frame_or_renderer if isinstance(frame_or_renderer, np.ndarray) else frame_or_renderer.get_frame()
+        if self.sinks is None:
+            self.sinks = self.create_sinks()
+        # Frames are fresh arrays from the renderer, so every sink can read the same one
+        for sink in self.sinks:
+            sink.put(frame, num_frames)
+        self.frames_written += num_frames
+
+    def mux_sound(self, movie_path):
+        """Adds the scene's audio track to the streamed movie, as Manim's combine_to_movie does."""
+        movie_path = str(movie_path)
+        base, extension = os.path.splitext(movie_path)
+        sound_path = base + ".wav"
+        # Makes sure the sound lasts as long as the video
+        self.add_audio_segment(AudioSegment.silent(0))
+        self.audio_segment.export(sound_path, format="wav", bitrate="312k")
+        audio_codecs = {".webm": (".ogg", "libvorbis"), ".mp4": (".aac", "aac")}
+        if extension in audio_codecs:
+            suffix, codec = audio_codecs[extension]
+            converted_path = base + suffix
+            convert_audio(sound_path, converted_path, codec)
+            os.remove(sound_path)
+            sound_path = converted_path
+
+        temp_path = f"{base}_temp{extension}"
+        with av.open(movie_path) as video_input, av.open(sound_path) as audio_input:
+            video_stream = video_input.streams.video[0]
+            audio_stream = audio_input.streams.audio[0]
+            with av.open(temp_path, mode="w") as output:
+                output_video_stream = output.add_stream_from_template(template=video_stream)
+                output_audio_stream = output.add_stream_from_template(template=audio_stream)
+                for input_container, stream, output_stream in (
+                    (video_input, video_stream, output_video_stream),
+                    (audio_input, audio_stream, output_audio_stream),
+                ):
+                    for packet in input_container.demux(stream):
+                        # Skip the flushing packets demux() ends with
+                        if packet.dts is None:
+                            continue
+                        packet.stream = output_stream
+                        output.mux(packet)
+        shutil.move(temp_path, movie_path)
+        os.remove(sound_path)
+
+    def finish(self):
+        if self.sinks is None:
+            super().finish()
+            return
+        sinks, self.sinks = self.sinks, None
+        errors = []
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+        if self.includes_sound:
+            self.mux_sound(self.movie_file_path)
+            if len(sinks) > 1:
+                logger.info("Sound is only added to the main movie, not to the other exports")
+        markers_path = os.path.splitext(str(self.movie_file_path))[0] + ".sections.json"
+        with open(markers_path, "w") as f:
+            json.dump([marker for marker in self.section_markers if marker["name"] != "autocreated"], f, indent=2)
+        for sink in sinks[1:]:
+            logger.info(f"Exported {sink.path}")
+        self.print_file_ready_message(self.movie_file_path)
+        if self.subcaptions:
+            self.write_subcaption_file()
+
+
+class StreamingEncoderMixin:
+    # None: enabled with STREAM_ENCODE=1 or EXPORT_FORMATS=... in the environment when the render starts;
+    # True/False on a scene overrides the environment
+    streaming_encoder = None
+
+    def setup(self):
+        super().setup()
+        enabled = streaming_requested() if self.streaming_encoder is None else self.streaming_encoder
+        if not enabled or not isinstance(self.renderer, CairoRenderer):
+            return
+        if not manim_version_supported():
+            logger.warning(
+                f"Streaming encoder supports Manim {'.'.join(map(str, SUPPORTED_MANIM[0]))} up to (not including) "
+                f"{'.'.join(map(str, SUPPORTED_MANIM[1]))}, found {manim.__version__}: using Manim's writer"
+            )
+            return
+        # GIF and image output, single stills and section videos still go through Manim's writer
+        if not write_to_movie() or is_gif_format() or config.save_last_frame or config.save_sections:
+            return
+        # Nothing has been written yet: setup() runs before construct()
+        self.renderer.file_writer = StreamingFileWriter(self.renderer, type(self).__name__)
@@ -0,0 +1,37 @@
+# Undrained pore-pressure generation and effective stress paths (p'-q) for
+# conventional triaxial compression (constant cell pressure sigma3).
+#
+# All functions work on whole strain/stress arrays at once, so a stress path
+# for every sample of a test is evaluated in a single call.
+
+import numpy as np
+
+
+def skempton_pore_pressure(q, A, B=1.0, d_sigma3=0.0):
+    """Excess pore pressure du = B * (d_sigma3 + A * (d_sigma1 - d_sigma3)) with d_sigma1 - d_sigma3 = q."""
+    q = np.asarray(q, dtype=float)
+    return B * (d_sigma3 + A * q)
+
+
+def effective_stress_path(q, sigma3, du):
+    """Mean effective stress p' = sigma3 + q/3 - du for each deviator stress q; returns (p', q)."""
+    q = np.asarray(q, dtype=float)
+    p_eff = sigma3 + q / 3 - np.asarray(du, dtype=float)
+    return p_eff, q
+
+
+def critical_state_q(p_eff, M):
+    """Deviator stress on the critical state line q = M p'."""
+    return M * np.asarray(p_eff, dtype=float)
+
+
+def friction_angle_to_M(phi_degrees):
+    """Critical state slope M = 6 sin(phi) / (3 - sin(phi)) for triaxial compression."""
+    s = np.sin(np.radians(phi_degrees))
+    return 6 * s / (3 - s)
+
+
+def M_to_friction_angle(M):
+    """Friction angle phi' (degrees) matching the critical state slope M in triaxial compression."""
+    M = np.asarray(M, dtype=float)
+    return np.degrees(np.arcsin(3 * M / (6 + M)))
@@ -0,0 +1,62 @@
+import csv
+
+import numpy as np
+import pytest
+
+from bts_batch import compute_bts, process_campaign, summary_statistics, write_results
+
+
+def write_campaign(tmp_path):
+    """Three specimens with logs in each supported format (one with a header row) and one without a log."""
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    displacement = np.linspace(0, 1, 11)
+    (logs / "S1.csv").write_text("disp,load\n" + "\n".join(f"{d},{p}" for d, p in zip(displacement, 12 * np.sin(np.pi * displacement))))
+    (logs / "S2.txt").write_text("# displacement load\n" + "\n".join(f"{d} {p}" for d, p in zip(displacement, 10 * displacement)))
+    (logs / "S3.dat").write_text("\n".join(f"{d} {p}" for d, p in zip(displacement, 8 - 8 * displacement)))
+    table = tmp_path / "specimens.csv"
+    table.write_text("specimen_id,D,T\nS1,54,27\nS2,54,30\nS3,50,25\nS4,54,27\n")
+    return logs, table
+
+
+def test_compute_bts():
+    # 2 P / (pi D T) with P in kN and D, T in mm gives MPa
+    assert compute_bts(10, 50, 25) == pytest.approx(2 * 10e3 / (np.pi * 50 * 25))
+    np.testing.assert_allclose(compute_bts([10, 20], 50, [25, 50]), compute_bts(10, 50, 25))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_campaign(tmp_path, workers, capsys):
+    logs, table = write_campaign(tmp_path)
+    rows, summary = process_campaign(str(logs), str(table), workers=workers, chunk_size=1)
+    assert "No log found for specimen S4" in capsys.readouterr().out
+
+    assert [row["specimen_id"] for row in rows] == ["S1", "S2", "S3"]
+    np.testing.assert_allclose([row["P"] for row in rows], [12, 10, 8])
+    np.testing.assert_allclose([row["displacement_at_peak"] for row in rows], [0.5, 1, 0])
+    np.testing.assert_allclose([row["BTS"] for row in rows], compute_bts([12, 10, 8], [54, 54, 50], [27, 30, 25]))
+    assert summary["count"] == 3
+    assert summary["mean"] == pytest.approx(np.mean([row["BTS"] for row in rows]))
+
+
+def test_summary_statistics():
+    summary = summary_statistics([1.0, 2.0, 3.0])
+    assert summary["std"] == pytest.approx(1.0)
+    assert summary["cov"] == pytest.approx(0.5)
+    assert summary_statistics([2.0])["std"] == 0.0
+    assert summary_statistics([]) == {"count": 0}
+
+
+def test_write_results(tmp_path):
+    logs, table = write_campaign(tmp_path)
+    rows, summary = process_campaign(str(logs), str(table), workers=1)
+    results = tmp_path / "results.csv"
+    summary_path = write_results(rows, summary, str(results))
+
+    with open(results, newline="") as f:
+        written = list(csv.DictReader(f))
+    assert [row["specimen_id"] for row in written] == ["S1", "S2", "S3"]
+    assert float(written[0]["BTS"]) == pytest.approx(rows[0]["BTS"], rel=1e-5)
+    with open(summary_path, newline="") as f:
+        statistics = dict(list(csv.reader(f))[1:])
+    assert float(statistics["count"]) == 3
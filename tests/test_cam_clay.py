@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from cam_clay import cam_clay_triaxial
+
+AXIAL_STRAIN = np.linspace(0, 0.3, 301)
+LAM, KAPPA, M = 0.2, 0.04, 0.9
+
+
+def test_undrained_normally_consolidated_strength_matches_critical_state():
+    # Undrained NC clay fails at p'f = p'0 (1/2)^((lambda - kappa) / lambda) and qf = M p'f
+    result = cam_clay_triaxial(150, AXIAL_STRAIN, lam=LAM, kappa=KAPPA, M=M)
+    p_failure = 150 * 0.5 ** ((LAM - KAPPA) / LAM)
+    assert M * p_failure == pytest.approx(77.54, abs=0.01)
+    assert result.q[0, -1] == pytest.approx(M * p_failure, rel=0.01)
+    assert result.p[0, -1] == pytest.approx(p_failure, rel=0.01)
+
+
+def test_undrained_paths_keep_constant_volume():
+    result = cam_clay_triaxial(150, AXIAL_STRAIN)
+    np.testing.assert_allclose(result.volumetric_strain, 0, atol=1e-12)
+    np.testing.assert_allclose(result.e, 1.0)
+    # Positive excess pore pressure for a contractive NC clay, matching dq/3 - dp'
+    np.testing.assert_allclose(result.du, result.q / 3 - (result.p - 150), atol=1e-9)
+    assert result.du[0, -1] > 0
+
+
+def test_drained_path_keeps_cell_pressure_constant():
+    result = cam_clay_triaxial(150, AXIAL_STRAIN, drained=True)
+    np.testing.assert_allclose(result.p - result.q / 3, 150, rtol=1e-9)
+    np.testing.assert_allclose(result.du, 0, atol=1e-9)
+    assert result.volumetric_strain[0, -1] > 0  # NC clay contracts
+
+
+def test_overconsolidation_and_critical_state():
+    result = cam_clay_triaxial([100, 150, 200], AXIAL_STRAIN, ocr=[1, 2, 4])
+    # Normally and lightly overconsolidated paths approach the CSL from below; the heavily
+    # overconsolidated one rises above it elastically and all of them end on it
+    assert (result.q[:2] <= M * result.p[:2] * (1 + 1e-6)).all()
+    assert (result.q[2] > M * result.p[2]).any()
+    np.testing.assert_allclose(result.q[:, -1] / result.p[:, -1], M, rtol=1e-4)
+    # Heavily overconsolidated clay dilates: negative excess pore pressure at large strain
+    assert result.du[0, -1] > 0
+    assert result.du[2, -1] < 0
+
+
+def test_series_matches_individual_paths_and_is_cached():
+    series = cam_clay_triaxial([100, 200], AXIAL_STRAIN, drained=[False, True])
+    single = cam_clay_triaxial(200, AXIAL_STRAIN, drained=True)
+    np.testing.assert_allclose(series.q[1], single.q[0])
+    assert cam_clay_triaxial([100, 200], AXIAL_STRAIN, drained=[False, True]) is series
+    assert not series.q.flags.writeable
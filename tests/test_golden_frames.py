@@ -0,0 +1,13 @@
+import pytest
+
+# Rendering the sampled frames needs Manim and its LaTeX setup; skipped where they are missing
+pytest.importorskip("manim")
+
+from golden_frames import GOLDEN_SCENES, main
+
+
+@pytest.mark.parametrize("scene_name", list(GOLDEN_SCENES))
+def test_golden_frames(scene_name):
+    with pytest.raises(SystemExit) as exit_info:
+        main([scene_name])
+    assert exit_info.value.code == 0, f"{scene_name} differs from its golden frames (details above)"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from peak_detector import EVENT_KINDS, PeakDetector, detect_events
+
+# Cemented-clay-like curve: yield at 0.5 %, peak at 2.5 %, softening from 6 %, residual q = 60,
+# densely sampled like a laboratory log
+STRAIN = np.linspace(0, 15, 1501)
+PLASTIC = np.clip(STRAIN - 0.5, 0, None)
+STRESS = np.where(
+    STRAIN < 0.5, 280 * STRAIN,
+    np.where(STRAIN <= 6, 140 + 20 * PLASTIC * np.exp(-PLASTIC / 2),
+             np.maximum(147 * np.exp(-0.3 * (STRAIN - 6)), 60)),
+)
+
+
+def test_events_on_the_clean_curve():
+    events = detect_events(STRAIN, STRESS)
+    assert list(events) == list(EVENT_KINDS)
+    assert events["yield"].strain == pytest.approx(0.52)
+    assert events["peak"].strain == pytest.approx(2.52)
+    assert events["softening"].strain == pytest.approx(6.0)
+    assert events["residual"].strain == pytest.approx(9.03)
+    assert events["residual"].stress == pytest.approx(60)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_noise_does_not_trigger_spurious_events(seed):
+    # 1 kPa of noise on every sample
+    noisy = STRESS + np.random.default_rng(seed).normal(0, 1, STRAIN.size)
+    peak = detect_events(STRAIN, noisy)["peak"]
+    assert 2 <= peak.strain <= 3.2
+
+    events = detect_events(STRAIN, noisy, min_step=0.05)
+    assert list(events) == list(EVENT_KINDS)
+    assert 2 <= events["peak"].strain <= 3.2
+    assert events["softening"].strain > 5.5
+
+
+def test_streaming_updates_match_the_offline_run():
+    detector = PeakDetector()
+    confirmed = []
+    for x, q in zip(STRAIN, STRESS):
+        confirmed.extend(detector.update(x, q))
+    # Every event is reported exactly once, in order
+    assert [event.kind for event in confirmed] == list(EVENT_KINDS)
+    assert detector.events == detect_events(STRAIN, STRESS)
+    detector.reset()
+    assert detector.events == {} and detector.index == -1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from shear_split import apply_rigid_motion, mohr_coulomb_angle, plane_normal, rigid_motion_matrix, split_polygon
+
+# 2 x 4 specimen outline standing on the origin, counter-clockwise
+SPECIMEN = np.array([[-1, 0], [1, 0], [1, 4], [-1, 4]], dtype=float)
+
+
+def polygon_area(vertices):
+    x, y = vertices[:, 0], vertices[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def test_mohr_coulomb_angle():
+    assert mohr_coulomb_angle(30) == 60
+    np.testing.assert_allclose(plane_normal(0), [0, 1, 0], atol=1e-12)
+
+
+def test_split_conserves_area_and_ends_the_crack_on_the_outline():
+    upper, lower, crack_start, crack_end = split_polygon(SPECIMEN, (0, 2, 0), 60)
+    assert polygon_area(upper) + polygon_area(lower) == pytest.approx(polygon_area(SPECIMEN))
+    # The crack descends to the right across the specimen, through the cut point
+    assert crack_start[0] == pytest.approx(-1) and crack_end[0] == pytest.approx(1)
+    assert crack_start[1] > crack_end[1]
+    np.testing.assert_allclose((crack_start + crack_end) / 2, [0, 2, 0], atol=1e-12)
+    # Every vertex of a piece lies on its side of the plane
+    normal = plane_normal(60)
+    assert ((upper - [0, 2, 0]) @ normal >= -1e-12).all()
+    assert ((lower - [0, 2, 0]) @ normal <= 1e-12).all()
+
+
+def test_two_and_three_dimensional_inputs_agree():
+    split_2d = split_polygon(SPECIMEN, (0, 2), 55)
+    split_3d = split_polygon(np.column_stack([SPECIMEN, np.zeros(4)]), (0, 2, 0), 55)
+    for a, b in zip(split_2d, split_3d):
+        np.testing.assert_allclose(a, b)
+
+
+def test_plane_missing_the_specimen_raises():
+    with pytest.raises(ValueError):
+        split_polygon(SPECIMEN, (0, 10), 60)
+
+
+def test_rigid_motion_preserves_shape_and_writes_in_place():
+    upper = split_polygon(SPECIMEN, (0, 2), 60)[0]
+    matrix = rigid_motion_matrix(np.radians(10), shift=(0.3, -0.2, 0), about=(0, 2, 0))
+    moved = apply_rigid_motion(upper, matrix)
+    distances = np.linalg.norm(upper[:, None] - upper[None], axis=2)
+    np.testing.assert_allclose(np.linalg.norm(moved[:, None] - moved[None], axis=2), distances, atol=1e-12)
+    # The pivot only follows the shift
+    np.testing.assert_allclose(apply_rigid_motion(np.array([[0, 2, 0.0]]), matrix), [[0.3, 1.8, 0]], atol=1e-12)
+
+    out = np.empty_like(upper)
+    assert apply_rigid_motion(upper, matrix, out=out) is out
+    np.testing.assert_allclose(out, moved)
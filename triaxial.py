@@ -4,7 +4,37 @@
 from manim import *
 import numpy as np
 
-class CementedClayTriaxialTest(Scene):
+from peak_detector import detect_events
+from plot_utils import stress_path_panel, tracked_curve
+from shear_split import apply_rigid_motion, mohr_coulomb_angle, rigid_motion_matrix, split_polygon
+from static_layers import StaticLayerMixin
+from streaming_writer import StreamingEncoderMixin
+from stress_path import M_to_friction_angle, effective_stress_path, skempton_pore_pressure
+
+CRITICAL_STATE_M = 1.0  # Cemented clay of CementedClayTriaxialTest (also used by the 3D variant)
+
+
+def cemented_clay_stress_strain(x):
+    """Stress-strain curve for cemented clay: steep elastic rise, peak, then softening to a residual q."""
+    if x < 0.5:
+        # Initial steep elastic region (cemented clay)
+        return 280 * x
+    elif x <= 6:
+        # Peak and beginning of softening
+        elastic_stress = 280 * 0.5
+        plastic_x = x - 0.5
+        peak_addition = 20 * plastic_x * np.exp(-plastic_x/2)
+        return elastic_stress + peak_addition
+    else:
+        # Strain softening
+        peak_stress = 147  # Approximate peak
+        softening_rate = 0.3
+        residual_stress = 60
+        softened = peak_stress * np.exp(-softening_rate * (x - 6))
+        return max(softened, residual_stress)
+
+
+class CementedClayTriaxialTest(StreamingEncoderMixin, StaticLayerMixin, Scene):
     def construct(self):
         # Define the triaxial cell outline
         cell_outline = RoundedRectangle(
@@ -34,6 +64,15 @@ class CementedClayTriaxialTest(Scene):
         
         y_label = MathTex("q", font_size=24)
         y_label.next_to(axes, LEFT, buff=0.2).rotate(90 * DEGREES)
+
+        # Effective stress path panel (p'-q) below the stress-strain graph
+        sigma3 = 100            # Cell pressure (kPa)
+        skempton_A = -0.1       # Dilatant cemented structure: negative excess pore pressure, path stays below the CSL
+        critical_state_M = CRITICAL_STATE_M
+        friction_angle = M_to_friction_angle(critical_state_M) # phi' matching M
+        pq_panel = stress_path_panel([0, 200, 50], [0, 180, 60], critical_state_M, x_length=3.5, y_length=1.2)
+        pq_panel.next_to(axes, DOWN, buff=0.8)
+        pq_axes = pq_panel[0]
         
         # Initial clay sample dimensions
         initial_height = 4
@@ -118,8 +157,11 @@ class CementedClayTriaxialTest(Scene):
             Create(axes),
             Write(x_label),
             Write(y_label),
+            FadeIn(pq_panel),
             run_time=2
         )
+        # Cell, water, base and graph axes stay fixed: draw them once into the background
+        self.bake_static(cell_outline, water, water_surface, base, axes, x_label, y_label, pq_panel)
         
         # Create confining pressure arrows (10 arrows surrounding the sample)
         confining_arrows = VGroup()
@@ -192,29 +234,33 @@ class CementedClayTriaxialTest(Scene):
         )
         
         self.play(GrowArrow(top_arrow), run_time=1)
+        self.bake_static(top_arrow)
         self.wait(0.5)
         
-        # Stress-strain curve function for cemented clay
-        def cemented_clay_stress_strain(x):
-            if x < 0.5:
-                # Initial steep elastic region (cemented clay)
-                return 280 * x
-            elif x <= 6:
-                # Peak and beginning of softening
-                elastic_stress = 280 * 0.5
-                plastic_x = x - 0.5
-                peak_addition = 20 * plastic_x * np.exp(-plastic_x/2)
-                return elastic_stress + peak_addition
-            else:
-                # Strain softening
-                peak_stress = 147  # Approximate peak
-                softening_rate = 0.3
-                residual_stress = 60
-                softened = peak_stress * np.exp(-softening_rate * (x - 6))
-                return max(softened, residual_stress)
-        
         # Shearing stages with crack formation and gradual sample breaking
         stages = 50
+
+        # Locate the peak, onset of softening and residual plateau on the model curve
+        strain_samples = np.linspace(0, 15, 1501)
+        stress_samples = [cemented_clay_stress_strain(x) for x in strain_samples]
+        curve_events = detect_events(strain_samples, stress_samples)
+
+        # Undrained stress path for the same samples, advanced by the strain tracker of the main curve
+        strain_tracker = ValueTracker(0)
+        path_q = np.array(stress_samples)
+        path_p, path_q = effective_stress_path(path_q, sigma3, skempton_pore_pressure(path_q, skempton_A))
+        stress_path = tracked_curve(pq_axes, path_p, path_q, strain_tracker, strain_samples, color=RED_E, stroke_width=3)
+        self.add(stress_path)
+
+        def stage_at_strain(event_kind, fallback_fraction):
+            # First stage whose strain reaches the detected event
+            if event_kind not in curve_events:
+                return int(stages * fallback_fraction)
+            return int(np.ceil(curve_events[event_kind].strain / 15 * (stages - 1)))
+
+        crack_stage = stage_at_strain("softening", 0.4)   # Crack opens as the sample starts to soften
+        slide_stage = stage_at_strain("residual", 0.6)    # Upper piece slides once the residual plateau is reached
+        peak_stage = stage_at_strain("peak", 0.2)
         # NO dimensional changes - sample maintains original size throughout
         final_height_ratio = 1.0  # NO height change
         final_width_ratio = 1.0   # NO width change
@@ -227,6 +273,7 @@ class CementedClayTriaxialTest(Scene):
         self.upper_piece = None # Use self to track pieces across stages
         self.lower_piece = None
         self.main_crack_visual = None
+        self.slide_tracker = None # Drives the rigid-body slide of the upper piece
         
         # Total piston travel during shearing (adjust for visual effect)
         total_piston_travel_at_failure = 0.3 
@@ -257,7 +304,7 @@ class CementedClayTriaxialTest(Scene):
             else:
                 stage_run_time = 0.3
             
-            animations_this_step = []
+            animations_this_step = [strain_tracker.animate.set_value(x_max)]
             if i == 1:
                 animations_this_step.append(Create(current_partial_curve))
             else:
@@ -276,38 +323,25 @@ class CementedClayTriaxialTest(Scene):
                 # Let piston move down proportionally to strain, up to a max before failure visualization
                 # This needs initial positions stored.
                 # Simpler: small incremental downward shift
-                piston_inc_displacement = total_piston_travel_at_failure / (stages * 0.6) # Distribute travel over pre-failure stages
-                if i <= int(stages * 0.6) : # Only move piston this way before explicit break animation
+                piston_inc_displacement = total_piston_travel_at_failure / slide_stage # Distribute travel over pre-failure stages
+                if i <= slide_stage : # Only move piston this way before explicit break animation
                     animations_this_step.append(top_piston.animate.shift(DOWN * piston_inc_displacement))
                     animations_this_step.append(loading_ram.animate.shift(DOWN * piston_inc_displacement))
 
             # Progressive crack formation and opening
-            sample_center_coords = clay_sample.get_center() # Use original sample for coords before it's replaced
-            
-            # Main failure crack starts at 60%
-            if i == int(stages * 0.4) and self.main_crack_visual is None:
-                # Define crack line geometry
-                cs_center = sample_center_coords
-                cs_width = initial_width # Use initial_width as sample doesn't change size
-                cs_height = initial_height
-
-                # Crack from approx top-left region to bottom-right region
-                p1 = cs_center + LEFT * cs_width/2 * 0.8 + UP * cs_height/2 * 0.5
-                p2 = cs_center + RIGHT * cs_width/2 * 0.8 + DOWN * cs_height/2 * 0.5
-                
-                # Ensure p1 and p2 are on the boundary or make sense for cutting
-                # For a more robust cut, ensure p1 and p2 are actual intersection points of a line with rectangle edges.
-                # Using simpler definition for now:
-                p1 = clay_sample.get_center() + LEFT * clay_sample.width * 0.45 + UP * clay_sample.height * 0.25
-                p2 = clay_sample.get_center() + RIGHT * clay_sample.width * 0.45 + DOWN * clay_sample.height * 0.25
+            # Main failure crack starts at the onset of softening
+            if i == crack_stage and self.main_crack_visual is None:
+                # Split the sample along the Mohr-Coulomb failure plane (45 + phi/2) through its centre
+                sample_corners = [clay_sample.get_corner(DL), clay_sample.get_corner(DR), clay_sample.get_corner(UR), clay_sample.get_corner(UL)]
+                upper_vertices, lower_vertices, p1, p2 = split_polygon(
+                    sample_corners, clay_sample.get_center(), mohr_coulomb_angle(friction_angle)
+                )
 
                 self.main_crack_visual = Line(p1, p2, color=YELLOW, stroke_width=4) # ADDED: Ensure crack visual is created
                 
                 # Create upper and lower pieces based on this crack
-                ul, ur, dr, dl = clay_sample.get_corner(UL), clay_sample.get_corner(UR), clay_sample.get_corner(DR), clay_sample.get_corner(DL)
-                
-                self.lower_piece = Polygon(dl, dr, p2, p1, color=ORANGE, fill_opacity=0.9, stroke_width=0) # MODIFIED: stroke_width=0
-                self.upper_piece = Polygon(p1, p2, ur, ul, color=ORANGE, fill_opacity=0.9, stroke_width=0) # MODIFIED: stroke_width=0
+                self.lower_piece = Polygon(*lower_vertices, color=ORANGE, fill_opacity=0.9, stroke_width=0) # MODIFIED: stroke_width=0
+                self.upper_piece = Polygon(*upper_vertices, color=ORANGE, fill_opacity=0.9, stroke_width=0) # MODIFIED: stroke_width=0
                 
                 animations_this_step.extend([
                     FadeOut(clay_sample), # clay_sample is the original rectangle
@@ -318,57 +352,62 @@ class CementedClayTriaxialTest(Scene):
                 ])
                 
             # Gradual sliding of upper piece after separation
-            elif i > int(stages * 0.6) and self.upper_piece is not None:
-                slide_progress_factor = (i - int(stages * 0.6)) / (stages - int(stages * 0.6)) # Factor from 0 to 1
-                
-                # Crack line vector (points from p1 to p2, defining slide direction)
-                # Ensure main_crack_visual is defined before accessing its properties
-                if self.main_crack_visual:
-                    crack_vector = normalize(self.main_crack_visual.get_end() - self.main_crack_visual.get_start())
-                else:
-                    # Fallback or error handling if main_crack_visual is not yet created
-                    # This case should ideally not be reached if logic is correct
-                    crack_vector = RIGHT # Default slide direction if crack not defined
-                
-                # Total slide distance and rotation
-                max_slide_distance = 0.1 # MODIFIED: Reduced slide distance
-                max_rotation_angle = 0 # MODIFIED: Reduced rotation for subtlety with smaller slide
-                
-                current_slide_distance = slide_progress_factor * max_slide_distance
-                current_rotation = slide_progress_factor * max_rotation_angle
-                
-                # Store the initial state of upper_piece if not already stored
-                if not hasattr(self, 'initial_upper_piece_mobject'):
-                    # This captures the state of self.upper_piece right after it's created
-                    self.initial_upper_piece_mobject = self.upper_piece.copy()
+            elif i > slide_stage and self.upper_piece is not None:
+                if self.slide_tracker is None:
+                    # Crack line vector (points from p1 to p2, defining slide direction)
+                    crack_start = self.main_crack_visual.get_start()
+                    crack_vector = normalize(self.main_crack_visual.get_end() - crack_start)
+                    
+                    # Total slide distance and rotation
+                    max_slide_distance = 0.1 # MODIFIED: Reduced slide distance
+                    max_rotation_angle = 0 # MODIFIED: Reduced rotation for subtlety with smaller slide
+                    
+                    # Rigid motion of the upper piece at every remaining stage, precomputed once
+                    slide_factors = np.arange(stages - slide_stage) / (stages - slide_stage) # Factor from 0 to 1
+                    slide_matrices = np.array([
+                        rigid_motion_matrix(-f * max_rotation_angle, crack_vector * f * max_slide_distance, crack_start) # Negative rotation for CW
+                        for f in slide_factors
+                    ])
+                    upper_points = self.upper_piece.points.copy()
+                    upper_tops = np.array([apply_rigid_motion(upper_points, m)[:, 1].max() for m in slide_matrices])
+                    self.slide_tracker = ValueTracker(0) # Fractional stage index into slide_matrices
 
-                # Create the target state for this animation step
-                # Start from the initial state of the broken piece
-                target_upper_piece = self.initial_upper_piece_mobject.copy()
-                
-                # Apply the total slide and rotation for the current progress
-                target_upper_piece.shift(crack_vector * current_slide_distance)
-                if self.main_crack_visual: # Ensure crack visual exists for rotation point
-                    target_upper_piece.rotate(-current_rotation, about_point=self.main_crack_visual.get_start()) # MODIFIED: Negative rotation for CW
-                else: # Fallback rotation if no crack visual (e.g. rotate about its own center)
-                    target_upper_piece.rotate(-current_rotation, about_point=target_upper_piece.get_center()) # MODIFIED: Negative rotation for CW
+                    def slide_state():
+                        s = self.slide_tracker.get_value()
+                        k = min(int(s), len(slide_matrices) - 2)
+                        a = s - k
+                        return k, a
 
+                    def move_upper_piece(piece):
+                        # Moves the Bezier points in place: no copy and no Transform per stage
+                        k, a = slide_state()
+                        matrix = (1 - a) * slide_matrices[k] + a * slide_matrices[k + 1]
+                        apply_rigid_motion(upper_points, matrix, out=piece.points)
 
-                animations_this_step.append(Transform(self.upper_piece, target_upper_piece))
-                
-                # Piston and ram follow the target state of the upper piece
-                # Target y for piston center: target_upper_piece.get_top()[1] + top_piston.height / 2.0
-                target_piston_center_y = target_upper_piece.get_top()[1] + top_piston.height / 2.0
-                
-                animations_this_step.append(top_piston.animate.move_to([top_piston.get_center()[0], target_piston_center_y, 0]))
-                
-                # Ram follows piston
-                # Target y for ram center: (piston_center_y + piston_height/2.0) + ram_height/2.0
-                target_ram_center_y = (target_piston_center_y + top_piston.height / 2.0) + loading_ram.height / 2.0
-                animations_this_step.append(loading_ram.animate.move_to([loading_ram.get_center()[0], target_ram_center_y, 0]))
+                    # Piston and ram keep their current offset from the top of the upper piece
+                    piston_offset = top_piston.get_y() - upper_tops[0]
+                    ram_offset = loading_ram.get_y() - upper_tops[0]
+
+                    def follow_upper_piece(offset):
+                        def updater(mob):
+                            k, a = slide_state()
+                            mob.set_y((1 - a) * upper_tops[k] + a * upper_tops[k + 1] + offset)
+                        return updater
+
+                    self.upper_piece.add_updater(move_upper_piece)
+                    top_piston.add_updater(follow_upper_piece(piston_offset))
+                    loading_ram.add_updater(follow_upper_piece(ram_offset))
+
+                animations_this_step.append(self.slide_tracker.animate.set_value(i - slide_stage))
 
             if animations_this_step: # Ensure there are animations to play
                 self.play(*animations_this_step, run_time=stage_run_time)
+
+            # Named moments (used by golden_frames.py)
+            if i == peak_stage:
+                self.next_section("peak load")
+            elif i == crack_stage:
+                self.next_section("crack onset")
             
             # Update self.current_stress_curve for the next iteration's Transform
             self.current_stress_curve = current_partial_curve
@@ -385,21 +424,26 @@ class CementedClayTriaxialTest(Scene):
             stroke_width=3
         )
         
-        # Mark peak point
-        peak_x = 3.5
-        peak_y = cemented_clay_stress_strain(peak_x)
+        # Mark peak point found by the detector
+        if "peak" in curve_events:
+            peak_x, peak_y = curve_events["peak"].strain, curve_events["peak"].stress
+        else:
+            peak_x = strain_samples[int(np.argmax(stress_samples))]
+            peak_y = cemented_clay_stress_strain(peak_x)
         peak_point = Dot(axes.c2p(peak_x, peak_y), color=YELLOW, radius=0.1)
         
         # Ensure self.current_stress_curve exists before trying to transform it
         if hasattr(self, 'current_stress_curve'):
             self.play(
                 Transform(self.current_stress_curve, final_curve),
+                strain_tracker.animate.set_value(15),
                 Create(peak_point),
                 run_time=1.5
             )
         else: # Fallback if current_stress_curve wasn't initialized (e.g. if stages = 0 or 1)
             self.play(
                 Create(final_curve),
+                strain_tracker.animate.set_value(15),
                 Create(peak_point),
                 run_time=1.5
             )
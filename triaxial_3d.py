@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# Optional 3D mode of the triaxial scenes: the specimen is a cylindrical
+# surface mesh instead of a 2D outline.
+#
+#   manim -pql triaxial_3d.py ClayTriaxialTest3D
+#   manim -pql triaxial_3d.py CementedClayTriaxialTest3D
+#
+# The mesh vertices are generated as one (rings x segments) grid from the same
+# deformation parameters as the 2D scenes (barreling profile, Mohr-Coulomb
+# shear plane) and copied into the face polygons in place every frame. The
+# number of segments follows the output resolution, so -ql draws a coarse mesh
+# that the Cairo renderer still handles quickly.
+
+from manim import *
+import numpy as np
+
+from clay_triaxial import clay_response, shearing_deformation, stress_strain_axes
+from peak_detector import detect_events
+from plot_utils import tracked_curve
+from shear_split import mohr_coulomb_angle
+from streaming_writer import StreamingEncoderMixin
+from stress_path import M_to_friction_angle
+from triaxial import CRITICAL_STATE_M as CEMENTED_CRITICAL_STATE_M, cemented_clay_stress_strain
+
+
+def mesh_resolution(pixel_height=None):
+    """(segments around, rings along) the specimen mesh for the output resolution."""
+    pixel_height = config.pixel_height if pixel_height is None else pixel_height
+    segments = int(np.clip(round(pixel_height / 30), 12, 64))  # 16 at 480p, 36 at 1080p
+    return segments, max(4, segments // 2)
+
+
+def barrel_profile(t, mid_ratio):
+    """Radius factor along the normalized height t: 1 at the platens, mid_ratio at mid-height (as bulged_shape)."""
+    return 1 + (mid_ratio - 1) * np.sin(np.pi * np.asarray(t, dtype=float))
+
+
+def shear_cut_heights(phi, z_center, radius, angle_degrees):
+    """Height of the inclined shear plane along the rim, z_cut = zc - tan(theta) r cos(phi)."""
+    return z_center - np.tan(np.radians(angle_degrees)) * radius * np.cos(phi)
+
+
+def front_arc(ring, phi, theta):
+    """Points of a closed rim ring (at angles phi) that face a camera at azimuth theta, as an open arc."""
+    visible = np.cos(phi - theta) >= -1e-9
+    # Start at the first visible point after a hidden one, so the arc does not wrap around
+    start = int(np.argmax(visible & ~np.roll(visible, 1)))
+    order = np.roll(np.arange(len(phi)), -start)
+    return ring[order[visible[order]]]
+
+
+def polygon_bezier_points(corners):
+    """Bezier points of closed straight-edged polygons: corners (..., n, 3) -> points (..., 4n, 3)."""
+    end = np.roll(corners, -1, axis=-2)
+    step = (end - corners) / 3
+    points = np.stack([corners, corners + step, end - step, end], axis=-2)
+    return points.reshape(*corners.shape[:-2], -1, 3)
+
+
+class CylinderMesh(VGroup):
+    def __init__(self, segments, rings, **style):
+        self.phi = np.linspace(0, TAU, segments, endpoint=False)
+        self.t = np.linspace(0, 1, rings + 1)
+        self.cos_phi = np.cos(self.phi)
+        self.sin_phi = np.sin(self.phi)
+        # Face (ring i, segment j) has the grid corners (i, j), (i, j + 1), (i + 1, j + 1), (i + 1, j)
+        i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing="ij")
+        j_next = (j + 1) % segments
+        self.face_rows = np.stack([i, i, i + 1, i + 1], axis=-1).reshape(-1, 4)
+        self.face_cols = np.stack([j, j_next, j_next, j], axis=-1).reshape(-1, 4)
+        # Separate faces, so the 3D camera can depth-sort and shade each of them
+        self.faces = [VMobject(shade_in_3d=True, **style) for _ in range(rings * segments)]
+        self.caps = [VMobject(shade_in_3d=True, **style) for _ in range(2)]
+        super().__init__(*self.faces, *self.caps)
+
+    def set_shape(self, radius, z_bottom, z_top, base=ORIGIN):
+        """Rebuilds every face from the radius of each ring and the end heights (scalars or one per segment)."""
+        radius = np.broadcast_to(radius, self.t.shape)[:, None]
+        z_bottom = np.broadcast_to(z_bottom, self.phi.shape)
+        z_top = np.broadcast_to(z_top, self.phi.shape)
+        z = z_bottom + self.t[:, None] * (z_top - z_bottom)
+        grid = np.stack([radius * self.cos_phi, radius * self.sin_phi, z], axis=-1) + base
+        face_points = polygon_bezier_points(grid[self.face_rows, self.face_cols])
+        for face, points in zip(self.faces, face_points):
+            face.points = points
+        # End caps are the bottom and top rings (elliptical where the ends follow the shear plane)
+        for cap, ring in zip(self.caps, (grid[0], grid[-1])):
+            cap.points = polygon_bezier_points(ring)
+        return self
+
+
+class ClayTriaxialTest3D(StreamingEncoderMixin, ThreeDScene):
+    resolution_dependent_geometry = True  # Mesh resolution follows the output resolution
+    def construct(self):
+        self.set_camera_orientation(phi=70 * DEGREES, theta=-90 * DEGREES)
+        segments, rings = mesh_resolution()
+
+        # Consolidated specimen of ClayTriaxialTest; world z is the specimen axis
+        height = 3.8
+        radius = 0.95
+        base_point = np.array([-3.5, 0, -2.2])  # Centre of the specimen base
+
+        # Same material, loading and barreling as ClayTriaxialTest (undrained, normally consolidated)
+        path_strain = np.linspace(0, 10, 401)
+        mcc = clay_response(path_strain)
+
+        pedestal = CylinderMesh(segments, 1, fill_color=GRAY, fill_opacity=1, stroke_color=GRAY_D, stroke_width=0.5)
+        pedestal.set_shape(radius * 1.15, -0.5, 0, base_point)
+        top_cap = CylinderMesh(segments, 1, fill_color=GRAY, fill_opacity=1, stroke_color=GRAY_D, stroke_width=0.5)
+        specimen = CylinderMesh(segments, rings, fill_color=GOLD_E, fill_opacity=1, stroke_color=GOLD, stroke_width=0.5)
+
+        strain_tracker = ValueTracker(0)
+
+        def specimen_height():
+            return height * shearing_deformation(strain_tracker.get_value() / 10)[0]
+
+        def deform_specimen(mob):
+            mid_ratio = shearing_deformation(strain_tracker.get_value() / 10)[1]
+            mob.set_shape(radius * barrel_profile(mob.t, mid_ratio), 0, specimen_height(), base_point)
+
+        def follow_specimen(mob):
+            h = specimen_height()
+            mob.set_shape(radius * 1.15, h, h + 0.5, base_point)
+
+        deform_specimen(specimen)
+        follow_specimen(top_cap)
+        specimen.add_updater(deform_specimen)
+        top_cap.add_updater(follow_specimen)
+
+        # Stress-strain graph stays flat on screen
+        axes = stress_strain_axes()
+        axes.scale(1.3).to_edge(RIGHT, buff=1)
+        x_label = Text("Axial Strain (%)", font_size=18)
+        x_label.next_to(axes, DOWN, buff=0.2)
+        y_label = MathTex("q", font_size=32)
+        y_label.next_to(axes, LEFT, buff=0.3)
+        curve = tracked_curve(axes, path_strain, mcc.q[0], strain_tracker, path_strain, color=RED_E, stroke_width=3)
+        self.add_fixed_in_frame_mobjects(axes, x_label, y_label)
+
+        self.play(FadeIn(pedestal), FadeIn(specimen), FadeIn(top_cap), Create(axes), Write(x_label), Write(y_label), run_time=1.5)
+        self.add_fixed_in_frame_mobjects(curve)
+
+        self.next_section("shearing")
+        self.play(strain_tracker.animate.set_value(10), run_time=8, rate_func=linear)
+        self.wait(2)
+
+
+class CementedClayTriaxialTest3D(StreamingEncoderMixin, ThreeDScene):
+    resolution_dependent_geometry = True  # Mesh resolution follows the output resolution
+    def construct(self):
+        self.set_camera_orientation(phi=70 * DEGREES, theta=-90 * DEGREES)
+        segments, rings = mesh_resolution()
+
+        # Specimen of CementedClayTriaxialTest; world z is the specimen axis
+        height = 4
+        radius = 1
+        base_point = np.array([-3.5, 0, -2.4])
+        friction_angle = M_to_friction_angle(CEMENTED_CRITICAL_STATE_M)
+        plane_angle = mohr_coulomb_angle(friction_angle)
+        max_slide_distance = 0.1
+
+        # Crack and slide start at the onset of softening and at the residual plateau, as in the 2D scene
+        strain_samples = np.linspace(0, 15, 1501)
+        stress_samples = np.array([cemented_clay_stress_strain(x) for x in strain_samples])
+        curve_events = detect_events(strain_samples, stress_samples)
+        crack_strain = curve_events["softening"].strain if "softening" in curve_events else 6
+        slide_strain = curve_events["residual"].strain if "residual" in curve_events else 9
+
+        style = {"fill_color": ORANGE, "fill_opacity": 1, "stroke_color": GOLD, "stroke_width": 0.5}
+        pedestal = CylinderMesh(segments, 1, fill_color=DARK_GRAY, fill_opacity=1, stroke_color=GRAY, stroke_width=0.5)
+        pedestal.set_shape(radius * 1.25, -0.5, 0, base_point)
+        top_cap = CylinderMesh(segments, 1, fill_color=GRAY, fill_opacity=1, stroke_color=GRAY_D, stroke_width=0.5)
+        top_cap.set_shape(radius, height, height + 0.5, base_point)
+        specimen = CylinderMesh(segments, rings, **style).set_shape(radius, 0, height, base_point)
+
+        axes = Axes(
+            x_range=[0, 15, 3],
+            y_range=[0, 150, 30],
+            axis_config={"color": WHITE},
+            x_length=3.5,
+            y_length=3,
+            tips=False
+        )
+        axes.to_edge(RIGHT, buff=1)
+        x_label = MathTex("\\varepsilon", font_size=24)
+        x_label.next_to(axes, DOWN, buff=0.2)
+        y_label = MathTex("q", font_size=24)
+        y_label.next_to(axes, LEFT, buff=0.2)
+        strain_tracker = ValueTracker(0)
+        curve = tracked_curve(axes, strain_samples, stress_samples, strain_tracker, strain_samples, color=RED_E, stroke_width=3)
+        self.add_fixed_in_frame_mobjects(axes, x_label, y_label)
+
+        self.play(FadeIn(pedestal), FadeIn(specimen), FadeIn(top_cap), Create(axes), Write(x_label), Write(y_label), run_time=2)
+        self.add_fixed_in_frame_mobjects(curve)
+        self.play(strain_tracker.animate.set_value(crack_strain), run_time=4, rate_func=linear)
+
+        # Split the cylinder along the shear plane through its centre; the cut is an ellipse on the rim
+        z_cut = shear_cut_heights(specimen.phi, height / 2, radius, plane_angle)
+        lower_piece = CylinderMesh(segments, rings, **style).set_shape(radius, 0, z_cut, base_point)
+        upper_piece = CylinderMesh(segments, rings, **style).set_shape(radius, z_cut, height, base_point)
+        crack_ring = np.stack([radius * specimen.cos_phi, radius * specimen.sin_phi, z_cut], axis=-1) + base_point
+        # Only the half of the rim facing the camera; the back half is hidden by the solid
+        crack = VMobject(stroke_color=YELLOW, stroke_width=4)
+        crack.set_points_as_corners(front_arc(crack_ring, specimen.phi, self.camera.get_theta()))
+        self.remove(specimen)
+        self.add(lower_piece, upper_piece)
+        self.next_section("crack onset")
+        self.play(Create(crack), strain_tracker.animate.set_value(slide_strain), run_time=3, rate_func=linear)
+
+        # Upper piece slides down the plane as a rigid body, carrying the cap with it
+        slide_direction = np.array([np.cos(np.radians(plane_angle)), 0, -np.sin(np.radians(plane_angle))])
+        slide_tracker = ValueTracker(0)
+
+        def slide(z_bottom, z_top):
+            def updater(m):
+                m.set_shape(radius, z_bottom, z_top, base_point + slide_tracker.get_value() * max_slide_distance * slide_direction)
+            return updater
+
+        upper_piece.add_updater(slide(z_cut, height))
+        top_cap.add_updater(slide(height, height + 0.5))
+        self.play(
+            slide_tracker.animate.set_value(1),
+            strain_tracker.animate.set_value(15),
+            run_time=3,
+            rate_func=linear
+        )
+        self.wait(2)
+
+
+if __name__ == '__main__':
+    print("Run this script with 'manim -pql triaxial_3d.py ClayTriaxialTest3D'")
+    print("or 'manim -pql triaxial_3d.py CementedClayTriaxialTest3D'")
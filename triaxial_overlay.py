@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Overlay of the q - strain curves of a whole triaxial test series.
+#
+# All curves are evaluated as one (specimens x strain) array, each curve is
+# drawn with a number of segments matched to its on-screen length in pixels,
+# and every curve is a slice of a single batched point array (one child
+# VMobject per specimen, so each keeps its own stroke colour), so growing
+# 100 curves costs one array update per frame.
+
+from manim import *
+import numpy as np
+
+from clay_triaxial import hyperbolic_stress_strain, stress_strain_axes
+from plot_utils import axes_points
+from static_layers import StaticLayerMixin
+from streaming_writer import StreamingEncoderMixin
+
+
+def series_stress_strain(strain, sigma3, reference_sigma3=400, reference_strength=88, C_hyperbolic=0.3):
+    """q for every specimen (rows) at every strain (columns); q_ult scales with the cell pressure."""
+    ultimate_strength = reference_strength * np.asarray(sigma3, dtype=float) / reference_sigma3
+    return hyperbolic_stress_strain(np.asarray(strain, dtype=float)[None, :], ultimate_strength[:, None], C_hyperbolic)
+
+
+def curve_sample_counts(axes, strain, q, pixels_per_segment=4, min_samples=6):
+    """Samples per curve so that each polyline segment spans about pixels_per_segment pixels on screen."""
+    points = axes_points(axes, np.broadcast_to(strain, q.shape), q)
+    scene_length = np.linalg.norm(np.diff(points, axis=1), axis=2).sum(axis=1)
+    pixel_length = scene_length * config.pixel_width / config.frame_width
+    samples = np.ceil(pixel_length / pixels_per_segment).astype(int) + 1
+    return np.clip(samples, min_samples, len(strain))
+
+
+class BatchedCurves(VMobject):
+    def __init__(self, axes, strain, q, sample_counts, colors=(BLUE_E, RED_E), **kwargs):
+        super().__init__(**kwargs)
+        # strain is a uniform grid shared by all rows of q
+        self.strain_step = strain[1] - strain[0]
+        self.q = q
+        self.origin = axes.c2p(0, 0)
+        self.x_unit = axes.c2p(1, 0) - self.origin
+        self.y_unit = axes.c2p(0, 1) - self.origin
+
+        # Flat layout: curve k owns samples offsets[k]:offsets[k + 1]
+        offsets = np.concatenate([[0], np.cumsum(sample_counts)])
+        self.fractions = np.concatenate([np.linspace(0, 1, n) for n in sample_counts])
+        self.rows = np.repeat(np.arange(len(sample_counts)), sample_counts)
+        segment_ends = np.ones(offsets[-1], dtype=bool)
+        segment_ends[offsets[1:] - 1] = False  # the last sample of a curve starts no segment
+        self.segment_starts = np.flatnonzero(segment_ends)
+
+        # Cairo strokes a whole VMobject with one colour or gradient, so each specimen gets a child
+        # whose points are its slice of the batched array, coloured by specimen index
+        segment_offsets = 4 * (offsets - np.arange(len(offsets)))
+        self.curve_slices = [slice(a, b) for a, b in zip(segment_offsets[:-1], segment_offsets[1:])]
+        self.add(*(
+            VMobject(stroke_color=color, stroke_width=self.stroke_width)
+            for color in color_gradient(colors, len(sample_counts))
+        ))
+        self.set_strain(0)
+
+    def set_strain(self, strain):
+        """Redraws every curve from zero to the given strain in one array update."""
+        eps = strain * self.fractions
+        # Linear interpolation on the uniform strain grid of the precomputed curves
+        position = np.minimum(eps / self.strain_step, self.q.shape[1] - 1)
+        j = np.minimum(position.astype(int), self.q.shape[1] - 2)
+        t = position - j
+        q = (1 - t) * self.q[self.rows, j] + t * self.q[self.rows, j + 1]
+
+        points = self.origin + eps[:, None] * self.x_unit + q[:, None] * self.y_unit
+        start = points[self.segment_starts]
+        end = points[self.segment_starts + 1]
+        step = (end - start) / 3
+        # Straight cubic Bezier segments, handed to each curve as a view of the batched array
+        points = np.stack([start, start + step, end - step, end], axis=1).reshape(-1, 3)
+        for curve, curve_slice in zip(self.submobjects, self.curve_slices):
+            curve.points = points[curve_slice]
+        return self
+
+
+class TriaxialSeriesOverlay(StreamingEncoderMixin, StaticLayerMixin, Scene):
+    resolution_dependent_geometry = True  # Curve segments are matched to the output pixel width
+    num_specimens = 24
+    sigma3_range = (50, 400)  # Cell pressures of the series (kPa)
+
+    def construct(self):
+        # Same axes as ClayTriaxialTest, enlarged for the overlay
+        axes = stress_strain_axes()
+        axes.scale(2).move_to(ORIGIN)
+        x_label = Text("Axial Strain (%)", font_size=24)
+        x_label.next_to(axes, DOWN, buff=0.3)
+        y_label = MathTex("q", font_size=40)
+        y_label.next_to(axes, LEFT, buff=0.4)
+
+        watermark = Text("Balaji Bandaru (CE21D009)", font_size=12)
+        watermark.to_corner(DL, buff=0.2)
+
+        self.play(Create(axes), Write(x_label), Write(y_label), run_time=1.5)
+        self.add(watermark)
+        self.bake_static(axes, x_label, y_label, watermark)
+
+        # Every curve of the series in one vectorized evaluation
+        sigma3 = np.linspace(*self.sigma3_range, self.num_specimens)
+        strain = np.linspace(0, 10, 1001)
+        q = series_stress_strain(strain, sigma3, reference_sigma3=self.sigma3_range[1])
+        sample_counts = curve_sample_counts(axes, strain, q)
+
+        # Colour runs from the lowest (BLUE_E) to the highest (RED_E) cell pressure
+        curves = BatchedCurves(axes, strain, q, sample_counts, colors=(BLUE_E, RED_E), stroke_width=2)
+        strain_tracker = ValueTracker(0)
+        curves.add_updater(lambda m: m.set_strain(strain_tracker.get_value()))
+        self.add(curves)
+
+        self.play(strain_tracker.animate.set_value(10), run_time=5, rate_func=linear)
+
+        # Label the lowest and highest cell pressure
+        labels = VGroup()
+        for row, color in ((0, BLUE_E), (-1, RED_E)):
+            label = MathTex(rf"\sigma_3 = {sigma3[row]:.0f}\,\text{{kPa}}", font_size=24, color=color)
+            label.next_to(axes.c2p(strain[-1], q[row, -1]), RIGHT, buff=0.15)
+            labels.add(label)
+        self.play(Write(labels), run_time=1)
+        self.wait(2)
+
+
+if __name__ == '__main__':
+    print("Run this script with 'manim -pql triaxial_overlay.py TriaxialSeriesOverlay'")